@@ -0,0 +1,276 @@
+import logging
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from anki.collection import AddNoteRequest, Collection
+from anki.exporting import AnkiPackageExporter
+from anki.models import NotetypeDict
+
+from media import STATE_FILE as MEDIA_STATE_FILE, MediaSync
+from notes import NoteData
+from template import CARD_CSS, JP_RU_FRONT, JP_RU_BACK, RU_JP_FRONT, RU_JP_BACK
+
+MODEL_NAME = "rujpankideck"
+FIELDS = ("Word", "Reading", "MainSense", "Senses")
+TEMPLATES = (
+    ("JP - RU", JP_RU_FRONT, JP_RU_BACK),
+    ("RU - JP", RU_JP_FRONT, RU_JP_BACK),
+)
+JP_DECK = "Слова::Японский - Русский::{}"
+RU_DECK = "Слова::Русский - Японский::{}"
+
+FIELD_SEP = "\x1f"
+UNDO_LABEL = "Сборка колоды"
+
+
+class SyncStats(NamedTuple):
+    added: int
+    updated: int
+    unchanged: int
+    removed: int
+    moved_cards: int
+    media_removed: int
+
+
+def ensure_model(col: Collection) -> NotetypeDict:
+    """Модель карточек. В существующей коллекции обновляет стили и шаблоны,
+    чтобы правки template.py попадали и в инкрементальную сборку."""
+    model = col.models.by_name(MODEL_NAME)
+    if not model:
+        model = col.models.new(MODEL_NAME)
+        for name in FIELDS:
+            col.models.add_field(model, col.models.new_field(name))
+        for name, front, back in TEMPLATES:
+            template = col.models.new_template(name)
+            template["qfmt"] = front
+            template["afmt"] = back
+            col.models.add_template(model, template)
+        model["css"] = CARD_CSS
+        col.models.add(model)
+        return col.models.by_name(MODEL_NAME)
+
+    changed = model["css"] != CARD_CSS
+    model["css"] = CARD_CSS
+    for template, (_, front, back) in zip(model["tmpls"], TEMPLATES):
+        changed |= (template["qfmt"], template["afmt"]) != (front, back)
+        template["qfmt"] = front
+        template["afmt"] = back
+    if changed:
+        col.models.update_dict(model)
+    return model
+
+
+class CollectionSync:
+    """Приводит коллекцию к списку заметок, меняя только отличия.
+
+    Заметки сопоставляются по guid (``generate_guid``); содержимое
+    сравнивается по строке полей ``notes.flds``, колоды - по ``cards.did``.
+    Новые заметки добавляются, изменённые обновляются, лишние удаляются
+    вместе с mp3, на которые больше никто не ссылается. Само аудио
+    раскладывает ``MediaSync`` до синхронизации.
+
+    Запись идёт пачками по ``batch_size``: ``add_notes`` и ``update_notes``
+    на пачку, перенос карточек RU - JP одним ``set_deck`` на колоду. Все
+    изменения сливаются в одну запись отмены.
+    """
+
+    def __init__(
+        self,
+        col: Collection,
+        model: NotetypeDict,
+        batch_size: int = 1000,
+    ):
+        self.col = col
+        self.batch_size = batch_size
+        self.model = model
+        self.media_dir = Path(col.media.dir())
+        self._decks: dict[str, tuple[int, int]] = {}
+
+    def decks_for(self, range_str: str) -> tuple[int, int]:
+        decks = self._decks.get(range_str)
+        if decks is None:
+            deck_jp = self.col.decks.id(JP_DECK.format(range_str))
+            deck_ru = self.col.decks.id(RU_DECK.format(range_str))
+            assert deck_jp is not None, "Не удалось получить ID колоды JP"
+            assert deck_ru is not None, "Не удалось получить ID колоды RU"
+            decks = self._decks[range_str] = (deck_jp, deck_ru)
+        return decks
+
+    def _existing_notes(self) -> dict[str, tuple[int, str]]:
+        return {
+            guid: (nid, flds)
+            for guid, nid, flds in self.col.db.all(
+                "SELECT guid, id, flds FROM notes WHERE mid = ?", self.model["id"]
+            )
+        }
+
+    def _existing_cards(self) -> dict[int, list[tuple[int, int, int]]]:
+        cards = defaultdict(list)
+        for cid, nid, ord_, did in self.col.db.all(
+            "SELECT c.id, c.nid, c.ord, c.did FROM cards c "
+            "JOIN notes n ON n.id = c.nid WHERE n.mid = ?",
+            self.model["id"],
+        ):
+            cards[nid].append((cid, ord_, did))
+        return cards
+
+    def _new_note(self, data: NoteData):
+        note = self.col.new_note(self.model)
+        note.guid = data.guid
+        for name, value in zip(FIELDS, data.fields):
+            note[name] = value
+        return note
+
+    def _add_batch(self, batch: list[NoteData]) -> None:
+        """Добавляет пачку заметок в колоды JP и переносит их вторые
+        карточки в колоды RU."""
+        notes = [self._new_note(data) for data in batch]
+        self.col.add_notes(
+            [
+                AddNoteRequest(note, self.decks_for(data.range_str)[0])
+                for note, data in zip(notes, batch)
+            ]
+        )
+
+        deck_by_note = {
+            note.id: self.decks_for(data.range_str)[1]
+            for note, data in zip(notes, batch)
+        }
+        moves: dict[int, list[int]] = defaultdict(list)
+        for cid, nid in self.col.db.all(
+            f"SELECT id, nid FROM cards WHERE ord = 1 AND nid IN "
+            f"({', '.join('?' * len(deck_by_note))})",
+            *deck_by_note,
+        ):
+            moves[deck_by_note[nid]].append(cid)
+        for deck_id, card_ids in moves.items():
+            self.col.set_deck(card_ids, deck_id)
+
+    def _update_batch(self, batch: list[tuple[int, NoteData]]) -> None:
+        notes = []
+        for nid, data in batch:
+            note = self.col.get_note(nid)
+            for name, value in zip(FIELDS, data.fields):
+                note[name] = value
+            notes.append(note)
+        self.col.update_notes(notes)
+
+    def sync(self, notes: Iterable[NoteData]) -> SyncStats:
+        undo_start = self.col.add_custom_undo_entry(UNDO_LABEL)
+
+        existing = self._existing_notes()
+        cards = self._existing_cards()
+        moves: dict[int, list[int]] = defaultdict(list)
+        referenced: set[str] = set()
+        to_add: list[NoteData] = []
+        to_update: list[tuple[int, NoteData]] = []
+        added = updated = unchanged = 0
+
+        for data in notes:
+            if data.audio is not None:
+                referenced.add(data.audio)
+
+            found = existing.pop(data.guid, None)
+            if found is None:
+                to_add.append(data)
+                if len(to_add) >= self.batch_size:
+                    added += len(to_add)
+                    self._add_batch(to_add)
+                    to_add = []
+                continue
+
+            nid, flds = found
+            if flds != FIELD_SEP.join(data.fields):
+                to_update.append((nid, data))
+                if len(to_update) >= self.batch_size:
+                    updated += len(to_update)
+                    self._update_batch(to_update)
+                    to_update = []
+            else:
+                unchanged += 1
+
+            decks = self.decks_for(data.range_str)
+            for cid, ord_, did in cards.get(nid, ()):
+                if ord_ < len(decks) and did != decks[ord_]:
+                    moves[decks[ord_]].append(cid)
+
+        if to_add:
+            added += len(to_add)
+            self._add_batch(to_add)
+        if to_update:
+            updated += len(to_update)
+            self._update_batch(to_update)
+
+        for deck_id, card_ids in moves.items():
+            self.col.set_deck(card_ids, deck_id)
+
+        removed = [nid for nid, _ in existing.values()]
+        if removed:
+            self.col.remove_notes(removed)
+
+        unused = [
+            entry.name
+            for entry in os.scandir(self.media_dir)
+            if entry.is_file()
+            and entry.name.endswith(".mp3")
+            and entry.name not in referenced
+        ]
+        if unused:
+            self.col.media.trash_files(unused)
+
+        self.col.merge_undo_entries(undo_start)
+
+        stats = SyncStats(
+            added,
+            updated,
+            unchanged,
+            len(removed),
+            sum(len(ids) for ids in moves.values()),
+            len(unused),
+        )
+        logging.info(
+            f"Заметки: добавлено {stats.added}, обновлено {stats.updated}, "
+            f"без изменений {stats.unchanged}, удалено {stats.removed}, "
+            f"перенесено карточек {stats.moved_cards}, удалено аудио "
+            f"{stats.media_removed}"
+        )
+        return stats
+
+
+def build_package(
+    collection_dir: Path | str,
+    output_file: Path | str,
+    notes: list[NoteData],
+    audio_folder: Path | str,
+    checksums: dict[str, str],
+    batch_size: int = 1000,
+    media_workers: int = 8,
+) -> SyncStats:
+    """Синхронизирует сборочную коллекцию в ``collection_dir`` с заметками
+    и экспортирует её в .apkg. Вызывается и в отдельных процессах, поэтому
+    открывает и закрывает коллекцию сама.
+
+    ``checksums`` - sha256 аудио по имени файла; в коллекцию попадают
+    только файлы, на которые ссылаются ``notes``."""
+    os.makedirs(collection_dir, exist_ok=True)
+    col = Collection(os.path.join(collection_dir, "collection.anki2"))
+    try:
+        media = {n.audio: checksums[n.audio] for n in notes if n.audio in checksums}
+        MediaSync(
+            col.media.dir(),
+            audio_folder,
+            os.path.join(collection_dir, MEDIA_STATE_FILE),
+            media_workers,
+        ).sync(media)
+
+        model = ensure_model(col)
+        stats = CollectionSync(col, model, batch_size).sync(notes)
+
+        exporter = AnkiPackageExporter(col)
+        exporter.exportInto(str(output_file))
+        logging.info(f"Готово! Файл создан: {output_file}")
+        return stats
+    finally:
+        col.close()
@@ -0,0 +1,4 @@
+# Лежит в корне ankimaker, а не в tests: tests - не пакет, чтобы не
+# конфликтовать с dictmaker/tests при общем запуске pytest, а модули
+# ankimaker импортируются по имени из этой папки.
+from shared.testing import db_session  # noqa: F401
@@ -1,139 +1,78 @@
 import os
 import logging
-import jaconv
 import shutil
-import hashlib
-
-from anki.collection import Collection
-from anki.exporting import AnkiPackageExporter
-from template import CARD_CSS, JP_RU_FRONT, JP_RU_BACK, RU_JP_FRONT, RU_JP_BACK
-
-from shared.config import TTS_OUTPUT_FOLDER
-from shared.database.db_session import init_db
-from shared.database.utils import get_by_word_and_reading, get_by_reading
-from shared.csv import get_words
-from shared.regex import has_kanji
-from shared.media import get_audio_filename
-
-
-def generate_guid(word: str, reading: str) -> str:
-    return hashlib.md5(f"{word}{reading}".encode()).hexdigest()
+from concurrent.futures import ProcessPoolExecutor
+
+from shared.audio_manifest import AudioManifest
+from shared.config import (
+    ANKI_BATCH_SIZE,
+    ANKI_BUILD_DIR,
+    ANKI_EXPORT_PROCESSES,
+    ANKI_FULL_REBUILD,
+    ANKI_MEDIA_WORKERS,
+    ANKI_MERGED,
+    ANKI_SHARDED,
+    AUDIO_MANIFEST_PATH,
+    TTS_OUTPUT_FOLDER,
+)
+from shared.database.db_session import init_db, get_readonly_session
+from shared.database.utils import load_translation_index
+from shared.csv import iter_words
+from shared.processes import pool_context
+
+from builder import build_package
+from notes import collect_notes, plan_packages
+
+OUTPUT_FILE = "japanese_vocab.apkg"
+
+
+def _init_worker():
+    logging.basicConfig(level=logging.INFO)
 
 
 def main():
     logging.basicConfig(level=logging.INFO)
     init_db()
 
-    temp_db = "temp_col.anki2"
-    if os.path.exists(temp_db):
-        os.remove(temp_db)
-
-    col = Collection(temp_db)
-    try:
-        model = col.models.by_name("rujpankideck")
-        if not model:
-            model = col.models.new("rujpankideck")
-            col.models.add_field(model, col.models.new_field("Word"))
-            col.models.add_field(model, col.models.new_field("Reading"))
-            col.models.add_field(model, col.models.new_field("MainSense"))
-            col.models.add_field(model, col.models.new_field("Senses"))
-
-        model["css"] = CARD_CSS
-
-        t1 = col.models.new_template("JP - RU")
-        t1["qfmt"] = JP_RU_FRONT
-        t1["afmt"] = JP_RU_BACK
-        col.models.add_template(model, t1)
-
-        t2 = col.models.new_template("RU - JP")
-        t2["qfmt"] = RU_JP_FRONT
-        t2["afmt"] = RU_JP_BACK
-        col.models.add_template(model, t2)
-        col.models.add(model)
-
-        words_dict = {f"{w[0]}-{w[2]}": w for w in get_words()[:21000]}
-        index = 1
-
-        for word in words_dict.values():
-            if index > 20000:
-                logging.info("20000 words found")
-                break
-            end_range = (index // 5000) * 5 + 5
-            range_str = f"{end_range:02}k"
-
-            current_deck_id_jp = col.decks.id(f"Слова::Японский - Русский::{range_str}")
-            current_deck_id_ru = col.decks.id(f"Слова::Русский - Японский::{range_str}")
-
-            assert current_deck_id_jp is not None, "Не удалось получить ID колоды JP"
-            assert current_deck_id_ru is not None, "Не удалось получить ID колоды RU"
-
-            reading = jaconv.kata2hira(word[2])
-            if has_kanji(word[0]):
-                res = get_by_word_and_reading(word[0], reading)
-                translations = [res] if res is not None else []
-            else:
-                translations = get_by_reading(reading)
-
-            if not translations:
-                logging.warning(
-                    f"Не найден перевод для слова {word[0]} с чтением {word[2]}"
-                )
-                continue
-
-            for translation in translations:
-                index += 1
-                word_val = translation.word.replace("\r", "").strip()
-                reading_val = (
-                    translation.reading.replace("\r\n", "<br>")
-                    .replace("\n", "<br>")
-                    .strip()
-                )
-                mainsense = (
-                    translation.mainsense.replace("\r\n", "<br>")
-                    .replace("\n", "<br>")
-                    .strip()
-                )
-                senses = (
-                    translation.senses.replace("\r\n", "<br>")
-                    .replace("\n", "<br>")
-                    .strip()
-                )
-
-                note = col.new_note(model)
-                note.guid = generate_guid(word_val, reading_val)
-                note["Word"] = word_val
-                note["Reading"] = reading_val
-                note["MainSense"] = mainsense
-                note["Senses"] = senses
-
-                audio_filename = get_audio_filename(word[0], word[2])
-                audio_path = os.path.join(TTS_OUTPUT_FOLDER, audio_filename)
-
-                if os.path.exists(audio_path):
-                    col.media.add_file(audio_path)
-                    note["Reading"] += f" [sound:{audio_filename}]"
-
-                col.add_note(note, current_deck_id_jp)
-
-                cards = note.cards()
-                if len(cards) > 1:
-                    card_ru = cards[1]
-                    card_ru.did = current_deck_id_ru
-                    col.update_card(card_ru)
-
-        exporter = AnkiPackageExporter(col)
-        output_file = "japanese_vocab.apkg"
-        exporter.exportInto(output_file)
-        logging.info(f"Готово! Файл создан: {output_file}")
-
-    finally:
-        col.close()
-        if os.path.exists(temp_db):
-            os.remove(temp_db)
-        if os.path.exists(temp_db + ".log"):
-            os.remove(temp_db + ".log")
-        if os.path.exists("temp_col.media"):
-            shutil.rmtree("temp_col.media")
+    if ANKI_FULL_REBUILD and os.path.exists(ANKI_BUILD_DIR):
+        logging.info("Полная пересборка: удаляем сборочную коллекцию")
+        shutil.rmtree(ANKI_BUILD_DIR)
+
+    manifest = AudioManifest(AUDIO_MANIFEST_PATH, TTS_OUTPUT_FOLDER)
+    manifest.reconcile()
+
+    words_dict = {f"{w[0]}-{w[2]}": w for w in iter_words(stop=21000)}
+
+    with get_readonly_session() as db:
+        translations_index = load_translation_index(db)
+    logging.info(f"Загружено переводов: {len(translations_index)}")
+
+    notes = list(collect_notes(words_dict.values(), translations_index, manifest))
+    checksums = manifest.checksums(
+        (n.audio for n in notes if n.audio is not None), ANKI_MEDIA_WORKERS
+    )
+    manifest.close()
+    options = (TTS_OUTPUT_FOLDER, checksums, ANKI_BATCH_SIZE, ANKI_MEDIA_WORKERS)
+    packages = plan_packages(
+        notes, ANKI_BUILD_DIR, OUTPUT_FILE, merged=ANKI_MERGED, sharded=ANKI_SHARDED
+    )
+
+    if len(packages) == 1:
+        build_package(*packages[0], *options)
+        return
+
+    processes = max(1, min(ANKI_EXPORT_PROCESSES, len(packages)))
+    logging.info(f"Собираем {len(packages)} пакетов в {processes} процессах")
+    with ProcessPoolExecutor(
+        processes,
+        mp_context=pool_context(),
+        initializer=_init_worker,
+    ) as pool:
+        futures = [
+            pool.submit(build_package, *package, *options) for package in packages
+        ]
+        for future in futures:
+            future.result()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+"""Раскладка аудио в медиапапку сборочной коллекции.
+
+Раньше каждый mp3 добавлялся через ``col.media.add_file`` прямо в цикле
+по заметкам: Anki читал и хэшировал файл при каждом добавлении, всё
+последовательно. Здесь набор файлов собирается заранее, сравнивается по
+sha256 из реестра аудио (``AudioManifest.checksums``) с тем, что уже
+лежит в папке, и недостающее раскладывается пулом потоков: жёсткой
+ссылкой, reflink-копией или, в крайнем случае, обычной копией. Файлы с
+одинаковым содержимым читаются один раз - остальные ссылаются на первый.
+
+Что и с каким хэшем лежит в папке, запоминается в ``media_state.json``
+рядом с коллекцией, поэтому неизменённые файлы повторно не читаются.
+"""
+
+import errno
+import json
+import logging
+import os
+import shutil
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+STATE_FILE = "media_state.json"
+
+# ioctl FICLONE из linux/fs.h: копия, разделяющая блоки с исходником
+_FICLONE = 0x40049409
+_NO_LINK = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}
+
+
+class MediaStats(NamedTuple):
+    unchanged: int
+    linked: int
+    cloned: int
+    copied: int
+    deduplicated: int
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    if sys.platform == "win32":
+        return False
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        target.unlink(missing_ok=True)
+        return False
+
+
+def place_file(source: Path, target: Path) -> str:
+    """Кладёт ``source`` по пути ``target`` самым дешёвым способом.
+    Возвращает "link", "clone" или "copy". Старый ``target`` заменяется
+    атомарно, недописанных файлов в папке не остаётся."""
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        try:
+            os.link(source, tmp)
+            method = "link"
+        except OSError as e:
+            if e.errno not in _NO_LINK:
+                raise
+            if _reflink(source, tmp):
+                method = "clone"
+            else:
+                shutil.copy2(source, tmp)
+                method = "copy"
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return method
+
+
+class MediaSync:
+    """Приводит mp3 в ``media_dir`` к набору ``{имя: sha256}``.
+
+    Лишние файлы не удаляет: это делает ``CollectionSync`` через корзину
+    Anki. Файл считается актуальным, если его хэш в состоянии совпадает с
+    хэшем исходника, а размер и mtime - с записанными.
+    """
+
+    def __init__(
+        self,
+        media_dir: Path | str,
+        audio_folder: Path | str,
+        state_path: Path | str,
+        workers: int = 8,
+    ):
+        self.media_dir = Path(media_dir)
+        self.audio_folder = Path(audio_folder)
+        self.state_path = Path(state_path)
+        self.workers = workers
+
+    def _load_state(self) -> dict[str, tuple[str, int, int]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return {name: tuple(value) for name, value in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logging.warning(f"Не удалось прочитать {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self, state: dict[str, tuple[str, int, int]]) -> None:
+        tmp = self.state_path.with_name(f"{self.state_path.name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
+
+    def _place_group(self, origin: Path | None, names: list[str]) -> list[str]:
+        """Раскладывает файлы с одинаковым содержимым: первый - из папки
+        аудио (если в медиа такого ещё нет), остальные - от него."""
+        methods = []
+        for name in names:
+            target = self.media_dir / name
+            if origin is None:
+                methods.append(place_file(self.audio_folder / name, target))
+                origin = target
+            else:
+                place_file(origin, target)
+                methods.append("dedup")
+        return methods
+
+    def sync(self, checksums: dict[str, str]) -> MediaStats:
+        os.makedirs(self.media_dir, exist_ok=True)
+        state = self._load_state()
+        on_disk: dict[str, os.stat_result] = {}
+        with os.scandir(self.media_dir) as it:
+            for item in it:
+                if item.name.endswith(".mp3") and item.is_file():
+                    on_disk[item.name] = item.stat()
+
+        current: dict[str, Path] = {}
+        pending: dict[str, list[str]] = defaultdict(list)
+        unchanged = 0
+        for name, sha256 in checksums.items():
+            stat = on_disk.get(name)
+            if stat is not None and state.get(name) == (
+                sha256,
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                current.setdefault(sha256, self.media_dir / name)
+                unchanged += 1
+            else:
+                pending[sha256].append(name)
+
+        methods: list[str] = []
+        if pending:
+            with ThreadPoolExecutor(self.workers) as pool:
+                for placed in pool.map(
+                    lambda group: self._place_group(current.get(group[0]), group[1]),
+                    pending.items(),
+                ):
+                    methods.extend(placed)
+
+        new_state = {}
+        for name, sha256 in checksums.items():
+            stat = os.stat(self.media_dir / name)
+            new_state[name] = (sha256, stat.st_size, stat.st_mtime_ns)
+        self._save_state(new_state)
+
+        stats = MediaStats(
+            unchanged,
+            methods.count("link"),
+            methods.count("clone"),
+            methods.count("copy"),
+            methods.count("dedup"),
+        )
+        logging.info(
+            f"Аудио: без изменений {stats.unchanged}, ссылок {stats.linked}, "
+            f"reflink {stats.cloned}, копий {stats.copied}, "
+            f"одинаковых по содержимому {stats.deduplicated}"
+        )
+        return stats
@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import os
+from itertools import groupby
+from pathlib import Path
+from typing import Container, Iterable, Iterator, NamedTuple
+
+from shared.csv import WordRecord
+from shared.database.lookup import TranslationIndex
+from shared.media import get_audio_filename
+from shared.regex import has_kanji
+
+NOTES_LIMIT = 20000
+RANGE_SIZE = 5000
+
+
+class NoteData(NamedTuple):
+    """Всё, что нужно для заметки колоды, без обращения к Anki.
+
+    ``fields`` идут в порядке полей модели: Word, Reading, MainSense, Senses.
+    """
+
+    guid: str
+    fields: tuple[str, str, str, str]
+    range_str: str
+    audio: str | None
+
+
+def generate_guid(word: str, reading: str) -> str:
+    return hashlib.md5(f"{word}{reading}".encode()).hexdigest()
+
+
+def range_for(index: int) -> str:
+    end_range = (index // RANGE_SIZE) * 5 + 5
+    return f"{end_range:02}k"
+
+
+def to_html(text: str) -> str:
+    return text.replace("\r\n", "<br>").replace("\n", "<br>").strip()
+
+
+def collect_notes(
+    words: Iterable[WordRecord],
+    translations_index: TranslationIndex,
+    audio_files: Container[str],
+    limit: int = NOTES_LIMIT,
+) -> Iterator[NoteData]:
+    """Заметки в порядке частотного списка. Перевод, уже попавший в колоду
+    через другое слово (тот же guid), второй раз не выдаётся."""
+    index = 1
+    seen: set[str] = set()
+
+    for word in words:
+        if index > limit:
+            logging.info(f"{limit} words found")
+            break
+        range_str = range_for(index)
+
+        reading = word.hira
+        if has_kanji(word[0]):
+            res = translations_index.by_word_and_reading(word[0], reading)
+            translations = [res] if res is not None else []
+        else:
+            translations = translations_index.by_reading(reading)
+
+        if not translations:
+            logging.warning(
+                f"Не найден перевод для слова {word[0]} с чтением {word[2]}"
+            )
+            continue
+
+        audio_filename = get_audio_filename(word[0], word[2])
+        audio = audio_filename if audio_filename in audio_files else None
+
+        for translation in translations:
+            index += 1
+            word_val = translation.word.replace("\r", "").strip()
+            reading_val = to_html(translation.reading)
+
+            guid = generate_guid(word_val, reading_val)
+            if guid in seen:
+                continue
+            seen.add(guid)
+
+            if audio is not None:
+                reading_val += f" [sound:{audio}]"
+
+            yield NoteData(
+                guid,
+                (
+                    word_val,
+                    reading_val,
+                    to_html(translation.mainsense),
+                    to_html(translation.senses),
+                ),
+                range_str,
+                audio,
+            )
+
+
+def plan_packages(
+    notes: list[NoteData],
+    build_dir: Path,
+    output_file: str,
+    merged: bool = True,
+    sharded: bool = False,
+) -> list[tuple[str, str, list[NoteData]]]:
+    """Пакеты для сборки: (папка коллекции, файл .apkg, заметки).
+
+    Общий пакет собирается, если он нужен или нарезка выключена, а при
+    ``sharded`` - ещё и по пакету на каждый диапазон частот (05k, 10k, ...)
+    со своей коллекцией в ``build_dir/shards``.
+    """
+    packages = []
+    if merged or not sharded:
+        packages.append((str(build_dir), output_file, notes))
+    if sharded:
+        stem, ext = os.path.splitext(output_file)
+        for range_str, group in groupby(notes, key=lambda n: n.range_str):
+            packages.append(
+                (
+                    str(build_dir / "shards" / range_str),
+                    f"{stem}_{range_str}{ext}",
+                    list(group),
+                )
+            )
+    return packages
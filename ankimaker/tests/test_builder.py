@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("anki")
+
+from anki.collection import Collection  # noqa: E402
+
+from builder import JP_DECK, RU_DECK, UNDO_LABEL, CollectionSync, SyncStats  # noqa: E402
+from builder import ensure_model  # noqa: E402
+from notes import NoteData, generate_guid  # noqa: E402
+
+
+@pytest.fixture
+def col(tmp_path):
+    collection = Collection(str(tmp_path / "collection.anki2"))
+    try:
+        yield collection
+    finally:
+        collection.close()
+
+
+def note(word: str, mainsense: str, range_str: str = "05k", audio: str | None = None):
+    reading = f"{word}よみ"
+    if audio is not None:
+        reading += f" [sound:{audio}]"
+    return NoteData(
+        generate_guid(word, f"{word}よみ"),
+        (word, reading, mainsense, f"1. {mainsense}"),
+        range_str,
+        audio,
+    )
+
+
+def sync(col: Collection, notes: list[NoteData], batch_size: int = 1000) -> SyncStats:
+    return CollectionSync(col, ensure_model(col), batch_size).sync(notes)
+
+
+def collection_notes(col: Collection) -> dict[str, tuple]:
+    """guid -> (поля, колоды карточек по порядку шаблонов)."""
+    result = {}
+    for nid in col.find_notes(""):
+        anki_note = col.get_note(nid)
+        cards = sorted(anki_note.cards(), key=lambda card: card.ord)
+        result[anki_note.guid] = (
+            tuple(anki_note.fields),
+            tuple(col.decks.name(card.did) for card in cards),
+        )
+    return result
+
+
+def expected(notes: list[NoteData]) -> dict[str, tuple]:
+    return {
+        n.guid: (n.fields, (JP_DECK.format(n.range_str), RU_DECK.format(n.range_str)))
+        for n in notes
+    }
+
+
+def test_sync_adds_updates_moves_and_removes_notes(col):
+    first = [note("彼", "он"), note("構築", "сооружение"), note("野", "поле")]
+    assert sync(col, first) == SyncStats(3, 0, 0, 0, 0, 0)
+    assert collection_notes(col) == expected(first)
+
+    second = [
+        note("彼", "он", range_str="10k"),
+        note("構築", "постройка"),
+        note("言う", "говорить"),
+    ]
+    assert sync(col, second) == SyncStats(1, 1, 1, 1, 2, 0)
+    assert collection_notes(col) == expected(second)
+    assert col.card_count() == 6
+
+
+def test_resync_without_changes_is_a_noop(col):
+    notes = [note("彼", "он"), note("言う", "говорить", range_str="10k")]
+    sync(col, notes)
+    before = {nid: col.get_note(nid).mod for nid in col.find_notes("")}
+
+    assert sync(col, notes) == SyncStats(0, 0, 2, 0, 0, 0)
+    assert {nid: col.get_note(nid).mod for nid in col.find_notes("")} == before
+
+
+def test_batched_sync_matches_note_by_note(tmp_path):
+    notes = [
+        note(word, f"перевод {i}", range_str=("05k", "10k")[i % 2], audio=f"{word}.mp3")
+        for i, word in enumerate(["彼", "構築", "野", "言う", "此れ"])
+    ]
+    results = []
+    for batch_size in (1, 2):
+        (tmp_path / str(batch_size)).mkdir()
+        col = Collection(str(tmp_path / str(batch_size) / "collection.anki2"))
+        try:
+            media_dir = Path(col.media.dir())
+            for n in notes + [note("古い", "старое", audio="古い.mp3")]:
+                (media_dir / n.audio).write_bytes(n.audio.encode())
+
+            stats = sync(col, notes, batch_size)
+
+            assert stats == SyncStats(5, 0, 0, 0, 0, 1)
+            assert col.undo_status().undo == UNDO_LABEL
+            assert col.media.check().missing == []
+            assert col.media.have("彼.mp3")
+            assert not col.media.have("古い.mp3")
+            results.append(collection_notes(col))
+        finally:
+            col.close()
+
+    assert results[0] == results[1] == expected(notes)
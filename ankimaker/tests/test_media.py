@@ -0,0 +1,69 @@
+import hashlib
+import os
+
+from media import MediaSync, place_file
+
+
+def sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_sync(tmp_path) -> MediaSync:
+    return MediaSync(
+        tmp_path / "media", tmp_path / "audio", tmp_path / "state.json", workers=2
+    )
+
+
+def write_audio(tmp_path, files: dict[str, bytes]) -> dict[str, str]:
+    (tmp_path / "audio").mkdir(exist_ok=True)
+    for name, data in files.items():
+        (tmp_path / "audio" / name).write_bytes(data)
+    return {name: sha(data) for name, data in files.items()}
+
+
+def test_place_file_replaces_target(tmp_path):
+    (tmp_path / "a.mp3").write_bytes(b"new")
+    (tmp_path / "b.mp3").write_bytes(b"old")
+
+    assert place_file(tmp_path / "a.mp3", tmp_path / "b.mp3") == "link"
+    assert (tmp_path / "b.mp3").read_bytes() == b"new"
+    assert sorted(os.listdir(tmp_path)) == ["a.mp3", "b.mp3"]
+
+
+def test_sync_links_once_and_dedups_by_content(tmp_path):
+    checksums = write_audio(
+        tmp_path, {"a.mp3": b"aaa", "b.mp3": b"bbb", "same.mp3": b"aaa"}
+    )
+
+    stats = make_sync(tmp_path).sync(checksums)
+
+    assert stats.unchanged == 0
+    assert stats.linked == 2
+    assert stats.deduplicated == 1
+    media = tmp_path / "media"
+    assert {name: (media / name).read_bytes() for name in checksums} == {
+        "a.mp3": b"aaa",
+        "b.mp3": b"bbb",
+        "same.mp3": b"aaa",
+    }
+
+    stats = make_sync(tmp_path).sync(checksums)
+    assert stats.unchanged == 3
+    assert stats.linked == stats.deduplicated == 0
+
+
+def test_sync_replaces_resynthesized_audio(tmp_path):
+    checksums = write_audio(tmp_path, {"a.mp3": b"aaa", "b.mp3": b"bbb"})
+    make_sync(tmp_path).sync(checksums)
+
+    # tts пишет во временный файл и переименовывает, ссылка в медиа остаётся
+    # на старое содержимое
+    (tmp_path / "audio" / "a.tmp").write_bytes(b"AAA")
+    os.replace(tmp_path / "audio" / "a.tmp", tmp_path / "audio" / "a.mp3")
+    checksums["a.mp3"] = sha(b"AAA")
+
+    stats = make_sync(tmp_path).sync(checksums)
+
+    assert stats.unchanged == 1
+    assert stats.linked == 1
+    assert (tmp_path / "media" / "a.mp3").read_bytes() == b"AAA"
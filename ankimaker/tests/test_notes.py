@@ -0,0 +1,91 @@
+from pathlib import Path
+from typing import NamedTuple
+
+from shared.csv import WordRecord
+from shared.database.utils import load_translation_index, save_to_sqlite
+
+from notes import NoteData, collect_notes, generate_guid, plan_packages, range_for
+
+
+class Row(NamedTuple):
+    word: str
+    reading: str
+    mainsense: str
+    senses: str
+    index_csv: int | None = None
+    examples: tuple = ()
+
+
+def record(word: str, reading: str, hira: str, index: int) -> WordRecord:
+    return WordRecord(word, "名詞", reading, 100, index, hira)
+
+
+def test_collect_notes_follows_frequency_order_and_skips_duplicates(db_session):
+    save_to_sqlite(
+        [
+            Row("彼", "かれ", "он", "1) он;\n2) возлюбленный"),
+            Row("此れ･是", "これ", "это", "это"),
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    words = [
+        record("彼", "カレ", "かれ", 0),
+        record("これ", "コレ", "これ", 1),
+        record("無い", "ナイ", "ない", 2),
+        record("彼", "カレ", "かれ", 3),
+    ]
+    notes = list(
+        collect_notes(words, load_translation_index(db_session), {"彼_カレ.mp3"})
+    )
+
+    assert [n.fields[0] for n in notes] == ["彼", "此れ･是"]
+    assert notes[0].guid == generate_guid("彼", "かれ")
+    assert notes[0].fields[1] == "かれ [sound:彼_カレ.mp3]"
+    assert notes[0].fields[3] == "1) он;<br>2) возлюбленный"
+    assert notes[0].audio == "彼_カレ.mp3"
+    assert notes[1].audio is None
+
+
+def test_collect_notes_stops_at_limit(db_session):
+    save_to_sqlite([Row("彼", "かれ", "он", "он")], db_session)
+    db_session.commit()
+
+    words = [record("彼", "カレ", "かれ", 0), record("彼", "カレ", "かれ", 1)]
+    assert (
+        len(
+            list(
+                collect_notes(words, load_translation_index(db_session), set(), limit=1)
+            )
+        )
+        == 1
+    )
+
+
+def test_range_for():
+    assert [range_for(i) for i in (1, 4999, 5000, 19999, 20000)] == [
+        "05k",
+        "05k",
+        "10k",
+        "20k",
+        "25k",
+    ]
+
+
+def test_plan_packages_splits_by_range():
+    notes = [
+        NoteData(str(i), ("w", "r", "m", "s"), range_str, None)
+        for i, range_str in enumerate(["05k", "05k", "10k", "15k"])
+    ]
+    build = Path("build")
+
+    assert plan_packages(notes, build, "deck.apkg") == [("build", "deck.apkg", notes)]
+
+    packages = plan_packages(notes, build, "deck.apkg", merged=False, sharded=True)
+    assert [(p[0], p[1], len(p[2])) for p in packages] == [
+        (str(build / "shards" / "05k"), "deck_05k.apkg", 2),
+        (str(build / "shards" / "10k"), "deck_10k.apkg", 1),
+        (str(build / "shards" / "15k"), "deck_15k.apkg", 1),
+    ]
+    assert len(plan_packages(notes, build, "deck.apkg", sharded=True)) == 4
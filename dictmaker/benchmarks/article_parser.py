@@ -0,0 +1,71 @@
+"""Скорость ArticleParser на статьях из тестов.
+
+Статьи берутся из строковых литералов dictmaker/tests/test_article_processor.py
+(без импорта pytest), каждая прогоняется через ``process_results`` и
+``get_mainsense``; результат - статей в секунду, лучший из нескольких
+повторов.
+
+Запуск:
+    uv run --package dictmaker python dictmaker/benchmarks/article_parser.py [rounds]
+"""
+
+import ast
+import logging
+import sys
+import time
+from pathlib import Path
+
+DICTMAKER_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(DICTMAKER_DIR))
+
+from parsers.article_parser import ArticleParser  # noqa: E402
+
+FIXTURES = DICTMAKER_DIR / "tests" / "test_article_processor.py"
+REPEATS = 5
+
+
+def load_articles(path: Path = FIXTURES) -> list[str]:
+    """Многострочные строковые литералы теста - это и есть статьи."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    return [
+        node.value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Constant)
+        and isinstance(node.value, str)
+        and "\n" in node.value
+    ]
+
+
+def articles_per_second(func, articles: list[str], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for article in articles:
+                func(article)
+        best = min(best, time.perf_counter() - start)
+    return len(articles) * rounds / best
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    logging.disable(logging.CRITICAL)
+    articles = load_articles()
+    parser = ArticleParser()
+
+    def mainsense(article: str):
+        try:
+            return parser.get_mainsense(article)
+        except IndexError:
+            return None
+
+    print(f"статей: {len(articles)}, повторов: {rounds}")
+    for name, func in (
+        ("process_results", lambda article: parser.process_results([article])),
+        ("get_mainsense", mainsense),
+    ):
+        print(f"{name:16} {articles_per_second(func, articles, rounds):10.0f} статей/с")
+
+
+if __name__ == "__main__":
+    main()
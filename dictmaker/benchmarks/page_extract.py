@@ -0,0 +1,74 @@
+"""Скорость разбора страниц Jardic: html2text против lxml.
+
+Страницы - сохранённые в dictmaker/tests/pages и страницы заглушки
+Jardic из тестов, плюс "большая" страница из строк сохранённой,
+повторённых ``rows`` раз (у частых слов в выдаче десятки статей).
+Меряются извлечение текста строк (``row_texts``) и весь путь до
+переводов (``parse``); результат - страниц в секунду, лучший из
+нескольких повторов.
+
+Запуск:
+    uv run --package dictmaker python dictmaker/benchmarks/page_extract.py [rounds] [rows]
+"""
+
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+DICTMAKER_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(DICTMAKER_DIR))
+
+from parsers.page_extractor import BACKENDS, PageExtractor  # noqa: E402
+from tests.jardic_stub import PAGES  # noqa: E402
+
+PAGES_DIR = DICTMAKER_DIR / "tests" / "pages"
+REPEATS = 5
+WORDCSV = ["言う", "動詞", "イウ"]
+
+
+def load_pages(rows: int) -> dict[str, list[bytes]]:
+    saved = [path.read_bytes() for path in sorted(PAGES_DIR.glob("*.html"))]
+    stub = [page.encode("utf-8") for page in PAGES.values()]
+
+    text = saved[0].decode("utf-8")
+    body = re.search(r"(<tr>.*</tr>)", text, re.S).group(1)
+    big = text.replace(body, body * rows).encode("utf-8")
+    return {"сохранённые": saved, "заглушка": stub, f"{rows}×строк": [big]}
+
+
+def pages_per_second(func, pages: list[bytes], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for page in pages:
+                func(page)
+        best = min(best, time.perf_counter() - start)
+    return len(pages) * rounds / best
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    logging.disable(logging.CRITICAL)
+
+    for name, pages in load_pages(rows).items():
+        print(f"{name} ({len(pages)} стр.)")
+        for backend in BACKENDS:
+            extractor = PageExtractor(backend)
+            rows_rate = pages_per_second(
+                lambda page: extractor.row_texts(WORDCSV[0], page), pages, rounds
+            )
+            parse_rate = pages_per_second(
+                lambda page: extractor.parse(WORDCSV, page), pages, rounds
+            )
+            print(
+                f"  {backend:10} строки {rows_rate:9.0f} стр/с, "
+                f"до переводов {parse_rate:9.0f} стр/с"
+            )
+
+
+if __name__ == "__main__":
+    main()
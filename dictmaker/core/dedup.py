@@ -0,0 +1,25 @@
+from shared.regex import split_by_dots
+
+SeenVariants = set[tuple[str, str]]
+
+
+def get_variants(text: str) -> set[str]:
+    if not text:
+        return set()
+    return {v.strip() for v in split_by_dots(text) if v.strip()}
+
+
+def is_duplicate_translation(translation, seen_set: SeenVariants) -> bool:
+    """Есть ли в ``seen_set`` хоть один вариант написания перевода с тем же
+    чтением."""
+    new_reading = translation.reading.strip("…")
+    for w in get_variants(translation.word):
+        if (w.strip("…"), new_reading) in seen_set:
+            return True
+    return False
+
+
+def add_to_seen(translation, seen_set: SeenVariants) -> None:
+    new_reading = translation.reading.strip("…")
+    for w in get_variants(translation.word):
+        seen_set.add((w.strip("…"), new_reading))
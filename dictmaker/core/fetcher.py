@@ -0,0 +1,51 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
+
+from core.stages import map_ordered
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class HostRateLimiter:
+    """Ограничивает частоту запросов к каждому хосту (запросов в секунду)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ConcurrentFetcher:
+    """Выполняет загрузку в пуле потоков, отдавая результаты в порядке входа.
+
+    Одновременно в работе не больше ``max_in_flight`` элементов, поэтому
+    входной итератор читается лениво и не опережает потребителя.
+    """
+
+    def __init__(self, concurrency: int, max_in_flight: int | None = None):
+        self.concurrency = max(1, concurrency)
+        self.max_in_flight = max(self.concurrency, max_in_flight or 2 * concurrency)
+
+    def map_ordered(
+        self, fn: Callable[[T], R], items: Iterable[T]
+    ) -> Iterator[tuple[T, R]]:
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            yield from map_ordered(executor, fn, items, self.max_in_flight)
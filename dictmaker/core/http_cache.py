@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+class CacheMiss(LookupError):
+    """Ответа нет в кэше, а сеть отключена (offline режим)."""
+
+
+class ResponseCache:
+    """Кэш HTTP ответов в SQLite, адресуемый по нормализованному URL.
+
+    Ключ - sha256 от URL с отсортированными параметрами запроса, поэтому
+    флаги словарей (dic_jardic, dic_warodai, ...) входят в ключ. Тела
+    хранятся сжатыми, устаревшие по TTL записи перекачиваются, а при
+    превышении ``max_bytes`` удаляются давно не читавшиеся записи.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        offline: bool = False,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_responses_accessed_at "
+            "ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        self._total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        normalized = urlunsplit(
+            (parts.scheme, parts.netloc.lower(), parts.path, query, "")
+        )
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> bytes | None:
+        key = self.make_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            body, created_at = row
+            if not self.offline and self.ttl and now - created_at > self.ttl:
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return zlib.decompress(body)
+
+    def put(self, url: str, content: bytes) -> None:
+        key = self.make_key(url)
+        body = zlib.compress(content, 6)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, body, len(body), now, now),
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def fetch(self, url: str, download: Callable[[], bytes]) -> bytes:
+        cached = self.get(url)
+        if cached is not None:
+            return cached
+
+        if self.offline:
+            raise CacheMiss(url)
+
+        content = download()
+        self.put(url, content)
+        return content
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        if not self.max_bytes or self._total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        victims = []
+        for key, size in rows:
+            if self._total <= target:
+                break
+            victims.append((key,))
+            self._total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.logger.debug(f"Из кэша удалено записей: {len(victims)}")
@@ -1,20 +1,25 @@
 import os
 import logging
+import time
 import traceback
 import jaconv
 
 from dotenv import load_dotenv
+from shared.config import DICT_BATCH_SIZE
+from shared.database.lookup import TranslationLookup
 from shared.database.utils import (
     save_to_sqlite,
-    get_by_reading,
-    get_by_word_and_reading,
+    save_raw_articles,
     add_not_found,
-    get_not_found,
-    get_all_parsed_indexes,
+    get_all_not_found,
+    get_translation_keys,
 )
-from shared.regex import has_kanji, split_by_dots
-from typing import List
+from shared.regex import has_kanji
+from shared.csv import WordRecord
+from typing import Iterable, Iterator
 from models.models import DictionaryList
+from core.dedup import SeenVariants, add_to_seen, is_duplicate_translation
+from core.stages import StageCounter
 from parsers.base import BaseWordParser
 from sqlalchemy.orm import Session
 
@@ -25,70 +30,100 @@ jardic_path = os.getenv("JARDIC_PATH", "C:\Program Files (x86)\JardicPro\JardicP
 
 
 class DictionaryProcessor:
-    def __init__(self, parser: BaseWordParser, session: Session):
+    def __init__(
+        self,
+        parser: BaseWordParser,
+        session: Session,
+        batch_size: int = DICT_BATCH_SIZE,
+    ):
         self.parser = parser
         self.session = session
+        self.batch_size = batch_size
         self.running = True
 
-        self.parsed_indexes = get_all_parsed_indexes(self.session)
+        self.lookup = TranslationLookup(get_translation_keys(self.session))
+        self.not_found = get_all_not_found(self.session)
         self.dictionary: DictionaryList = list()
+        self.raw_articles: list[dict] = []
+        self.persist_stats = StageCounter("дедупликация и запись")
 
     def stop(self):
         self.running = False
 
-    def _get_variants(self, text: str) -> set[str]:
-        if not text:
-            return set()
-        return {v.strip() for v in split_by_dots(text) if v.strip()}
-
-    def is_duplicate_translation(
-        self, translation, seen_set: set[tuple[str, str]]
-    ) -> bool:
-        new_words = self._get_variants(translation.word)
-        new_reading = translation.reading
-
-        for w in new_words:
-            if (w.strip("…"), new_reading.strip("…")) in seen_set:
-                return True
-        return False
-
-    def _add_to_seen(self, translation, seen_set: set[tuple[str, str]]):
-        new_words = self._get_variants(translation.word)
-        new_reading = translation.reading
-        for w in new_words:
-            clean_word = w.strip("…")
-            clean_reading = new_reading.strip("…")
-            seen_set.add((clean_word, clean_reading))
+    def is_duplicate_translation(self, translation, seen_set: SeenVariants) -> bool:
+        return is_duplicate_translation(translation, seen_set)
+
+    def _add_to_seen(self, translation, seen_set: SeenVariants):
+        add_to_seen(translation, seen_set)
 
     def is_word_parsed(self, word, reading_kata, index) -> bool:
-        if index in self.parsed_indexes:
+        if index in self.lookup.indexes:
             return True
         reading = jaconv.kata2hira(reading_kata)
         if has_kanji(word):
-            exists = get_by_word_and_reading(word, reading, self.session)
+            exists = self.lookup.has_word(word, reading)
         else:
-            exists = get_by_reading(reading, session=self.session)
-
-        if not exists:
-            exists = get_not_found(word, reading_kata, self.session)
-
-        return bool(exists)
-
-    def parse_words(self, words: List[List[str]]) -> None:
-        batch_size = 50
-        seen_in_batch = set()
-        for index, wordcsv in enumerate(words):
+            exists = self.lookup.has_reading(reading)
+
+        return exists or (word, reading_kata) in self.not_found
+
+    def _save_batch(self) -> None:
+        save_to_sqlite(self.dictionary, self.session)
+        save_raw_articles(self.raw_articles, self.session)
+        self.session.commit()
+        self.raw_articles.clear()
+        for translation in self.dictionary:
+            self.lookup.add(
+                translation.word, translation.reading, translation.index_csv
+            )
+        self.dictionary.clear()
+
+    def flush(self) -> None:
+        """Сохраняет то, что не набрало полного батча."""
+        if self.dictionary or self.raw_articles:
+            self._save_batch()
+
+    def _keep_articles(self, index: int, wordcsv, articles: tuple[str, ...]) -> None:
+        self.raw_articles.extend(
+            {
+                "source": self.parser.source,
+                "query_word": wordcsv[0],
+                "query_reading": wordcsv[2],
+                "index_csv": index,
+                "position": position,
+                "text": text,
+            }
+            for position, text in enumerate(articles)
+        )
+
+    def _pending_words(
+        self, words: Iterable[WordRecord]
+    ) -> Iterator[tuple[int, WordRecord]]:
+        for wordcsv in words:
             if not self.running:
-                save_to_sqlite(self.dictionary, self.session)
                 break
             word, _, reading_raw = wordcsv[:3]
+            index = wordcsv.index
             try:
                 if self.is_word_parsed(word, reading_raw, index):
                     continue
-                logging.info(f"Parsing word: {word} at index {index}")
-
-                translations = self.parser.parse_article(wordcsv)
+            except Exception as e:
+                logging.error(f"Error when checking {word}: {e}")
+                logging.error(traceback.format_exc())
+                continue
+            logging.info(f"Parsing word: {word} at index {index}")
+            yield index, wordcsv
 
+    def parse_words(self, words: Iterable[WordRecord]) -> None:
+        seen_in_batch = set()
+        results = self.parser.parse_articles(self._pending_words(words))
+        for index, wordcsv, translations, articles in results:
+            if not self.running:
+                break
+            word, _, reading_raw = wordcsv[:3]
+            start = time.perf_counter()
+            try:
+                self._keep_articles(index, wordcsv, articles)
                 if translations is None:
                     continue
 
@@ -107,15 +142,23 @@ class DictionaryProcessor:
                         f"translations len: {len(translations)} for word {word} at index {index}"
                     )
                     add_not_found(word, reading_raw, self.session)
+                    self.not_found.add((word, reading_raw))
 
-                if len(self.dictionary) >= batch_size:
-                    save_to_sqlite(self.dictionary, self.session)
-                    self.session.commit()
-                    self.dictionary.clear()
+                if len(self.dictionary) >= self.batch_size:
+                    self._save_batch()
                     seen_in_batch.clear()
                     logging.info("Batch saved to database.")
+                    self.log_stage_stats()
 
             except Exception as e:
                 logging.error(f"Error when parsing {word[0]}: {e}")
                 logging.error(traceback.format_exc())
                 continue
+            finally:
+                self.persist_stats.add(time.perf_counter() - start)
+
+        self.log_stage_stats()
+
+    def log_stage_stats(self) -> None:
+        stages = [*self.parser.stage_stats(), self.persist_stats]
+        logging.info("Стадии: " + "; ".join(str(stage) for stage in stages))
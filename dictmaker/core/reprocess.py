@@ -0,0 +1,173 @@
+import itertools
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from shared.database.models import RawArticleTable
+from shared.database.utils import delete_translations, save_to_sqlite
+from shared.processes import pool_context
+from core.dedup import SeenVariants, add_to_seen, is_duplicate_translation
+from models.models import Translation
+from parsers.article_parser import ArticleParser
+
+
+class WordArticles(NamedTuple):
+    """Все сохранённые статьи одного слова частотного списка - так же,
+    как их получает ArticleParser при скачивании."""
+
+    index_csv: int | None
+    query_word: str
+    query_reading: str
+    texts: list[str]
+
+
+class WordResult(NamedTuple):
+    """Переводы слова; None, если ArticleParser упал на его статьях."""
+
+    index_csv: int | None
+    query_word: str
+    query_reading: str
+    translations: list[Translation] | None
+
+
+Chunk = list[WordArticles]
+
+_parser: ArticleParser | None = None
+
+
+class ReprocessStats(NamedTuple):
+    articles: int
+    translations: int
+    deleted: int
+    failed: int
+    empty: int
+
+
+def process_chunk(chunk: Chunk) -> list[WordResult]:
+    """Переводы пачки слов. Статьи слова разбираются вместе, как в
+    ``PageExtractor.process_articles``."""
+    global _parser
+    if _parser is None:
+        _parser = ArticleParser()
+
+    results: list[WordResult] = []
+    for word in chunk:
+        try:
+            translations = _parser.process_results(word.texts)
+        except Exception as e:
+            logging.error(f"Error parsing word {word.query_word}: {e}")
+            translations = None
+        results.append(WordResult(*word[:3], translations))
+    return results
+
+
+def iter_raw_chunks(session: Session, chunk_size: int) -> Iterator[Chunk]:
+    """Статьи из raw_articles, сгруппированные по слову, пачками примерно
+    по ``chunk_size`` статей. Слово между пачками не делится."""
+    rows = session.execute(
+        select(
+            RawArticleTable.index_csv,
+            RawArticleTable.query_word,
+            RawArticleTable.query_reading,
+            RawArticleTable.text,
+        )
+        .order_by(
+            RawArticleTable.index_csv,
+            RawArticleTable.query_word,
+            RawArticleTable.query_reading,
+            RawArticleTable.source,
+            RawArticleTable.position,
+        )
+        .execution_options(yield_per=chunk_size)
+    )
+    chunk: Chunk = []
+    size = 0
+    for key, group in itertools.groupby(rows, key=lambda row: tuple(row[:3])):
+        texts = [row.text for row in group]
+        chunk.append(WordArticles(*key, texts))
+        size += len(texts)
+        if size >= chunk_size:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+
+def reprocess(
+    session: Session,
+    processes: int = 1,
+    chunk_size: int = 500,
+    batch_size: int = 500,
+) -> ReprocessStats:
+    """Заново разбирает все статьи из raw_articles и переписывает переводы
+    слов, у которых они есть: старые переводы этих index_csv удаляются,
+    новые вставляются пачками по ``batch_size`` с той же дедупликацией
+    вариантов, что и при скачивании, всё в одной транзакции.
+
+    Переводы слов без сохранённых статей не трогаются, как и переводы
+    слов, статьи которых теперь не разбираются (ошибка ArticleParser) или
+    не дают ни одного перевода - при скачивании такие слова тоже ничего
+    не записывают.
+
+    При ``processes > 1`` статьи разбираются в пуле процессов пачками по
+    ``chunk_size``.
+    """
+    start = time.perf_counter()
+    chunks = iter_raw_chunks(session, chunk_size)
+    results: list[WordResult] = []
+    articles = 0
+
+    def counted(it: Iterator[Chunk]) -> Iterator[Chunk]:
+        nonlocal articles
+        for chunk in it:
+            articles += sum(len(word.texts) for word in chunk)
+            yield chunk
+
+    if processes > 1:
+        with ProcessPoolExecutor(processes, mp_context=pool_context()) as pool:
+            for chunk_results in pool.map(process_chunk, counted(chunks)):
+                results.extend(chunk_results)
+    else:
+        for chunk_results in map(process_chunk, counted(chunks)):
+            results.extend(chunk_results)
+
+    parsed = [r for r in results if r.translations]
+    failed = sum(r.translations is None for r in results)
+    empty = len(results) - len(parsed) - failed
+    parsed_at = time.perf_counter()
+    logging.info(
+        f"Разобрано статей: {articles} за {parsed_at - start:.1f} с "
+        f"({articles / max(parsed_at - start, 1e-9):.0f}/с), "
+        f"слов с переводами {len(parsed)}, без переводов {empty}, ошибок {failed}"
+    )
+
+    deleted = delete_translations(
+        {r.index_csv for r in parsed if r.index_csv is not None}, session
+    )
+    saved = 0
+    dictionary: list[Translation] = []
+    seen_in_batch: SeenVariants = set()
+    for result in parsed:
+        for translation in result.translations:
+            if not is_duplicate_translation(translation, seen_in_batch):
+                translation.index_csv = result.index_csv
+                dictionary.append(translation)
+                add_to_seen(translation, seen_in_batch)
+        if len(dictionary) >= batch_size:
+            save_to_sqlite(dictionary, session)
+            saved += len(dictionary)
+            dictionary.clear()
+            seen_in_batch.clear()
+    save_to_sqlite(dictionary, session)
+    saved += len(dictionary)
+    session.commit()
+
+    logging.info(
+        f"Переводы переписаны: удалено {deleted}, записано {saved} "
+        f"за {time.perf_counter() - parsed_at:.1f} с"
+    )
+    return ReprocessStats(articles, saved, deleted, failed, empty)
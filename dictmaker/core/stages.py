@@ -0,0 +1,59 @@
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class StageCounter:
+    """Счётчик стадии конвейера: сколько элементов прошло и сколько
+    секунд на них потрачено внутри стадии (суммарно по всем потокам или
+    процессам). Потокобезопасен."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, items: int = 1) -> None:
+        with self._lock:
+            self.items += items
+            self.busy += seconds
+
+    @property
+    def rate(self) -> float:
+        return self.items / self.busy if self.busy else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.items} за {self.busy:.1f} с ({self.rate:.1f}/с)"
+
+
+def map_ordered(
+    executor: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_in_flight: int,
+) -> Iterator[tuple[T, R]]:
+    """Выполняет ``fn`` в ``executor``, отдавая результаты в порядке входа.
+
+    Одновременно в работе не больше ``max_in_flight`` элементов: это
+    ограниченная очередь между стадиями, входной итератор читается лениво
+    и не опережает потребителя.
+    """
+    in_flight: deque[tuple[T, Future[R]]] = deque()
+    try:
+        for item in items:
+            in_flight.append((item, executor.submit(fn, item)))
+            if len(in_flight) >= max_in_flight:
+                done_item, future = in_flight.popleft()
+                yield done_item, future.result()
+
+        while in_flight:
+            done_item, future = in_flight.popleft()
+            yield done_item, future.result()
+    finally:
+        for _, future in in_flight:
+            future.cancel()
@@ -2,10 +2,23 @@ import sys
 import signal
 import logging
 
-from shared.config import JARDIC_PATH, DICT_URL
+from shared.config import (
+    JARDIC_PATH,
+    DICT_URL,
+    JARDIC_CONCURRENCY,
+    JARDIC_RATE_LIMIT,
+    JARDIC_MAX_IN_FLIGHT,
+    JARDIC_PARSE_PROCESSES,
+    JARDIC_HTML_BACKEND,
+    HTTP_CACHE_ENABLED,
+    HTTP_CACHE_PATH,
+    HTTP_CACHE_TTL_DAYS,
+    HTTP_CACHE_MAX_MB,
+    HTTP_OFFLINE,
+)
 from shared.database.db_session import init_db, SessionLocal
-from shared.database.utils import save_to_sqlite
-from shared.csv import get_words
+from shared.csv import iter_words
+from core.http_cache import ResponseCache
 from core.processor import DictionaryProcessor
 from parsers.gui_word_parser import WordParserGUI
 from parsers.word_parser import WordParser
@@ -32,7 +45,25 @@ def main():
         parser = WordParserGUI(JARDIC_PATH)
     else:
         logging.info("Используем веб-скраппер (Non-Windows)")
-        parser = WordParser(DICT_URL)
+        cache = None
+        if HTTP_CACHE_ENABLED or HTTP_OFFLINE:
+            cache = ResponseCache(
+                HTTP_CACHE_PATH,
+                ttl=HTTP_CACHE_TTL_DAYS * 24 * 60 * 60,
+                max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024,
+                offline=HTTP_OFFLINE,
+            )
+            if HTTP_OFFLINE:
+                logging.info("Offline режим: страницы берутся только из кэша")
+        parser = WordParser(
+            DICT_URL,
+            concurrency=JARDIC_CONCURRENCY,
+            rate_limit=JARDIC_RATE_LIMIT,
+            max_in_flight=JARDIC_MAX_IN_FLIGHT,
+            cache=cache,
+            processes=JARDIC_PARSE_PROCESSES,
+            html_backend=JARDIC_HTML_BACKEND,
+        )
 
     processor = DictionaryProcessor(parser=parser, session=session)
 
@@ -44,12 +75,9 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
 
     try:
-        words_to_parse = get_words()
-        processor.parse_words(words_to_parse[:174])
+        processor.parse_words(iter_words(stop=174))
 
-        if processor.dictionary:
-            save_to_sqlite(processor.dictionary, session=session)
-            session.commit()
+        processor.flush()
 
         logging.info("Парсинг завершён.")
     except Exception as e:
@@ -1,6 +1,6 @@
 from shared.regex import has_cyrillic, get_yarxi_readings, has_kanji, split_by_dots
 import jaconv
-from typing import List
+from typing import Iterator, List
 import logging
 import re
 
@@ -15,6 +15,12 @@ class ArticleParser:
     LIST_RE = re.compile(r"\d+[\.\)]:?\s+([^:\n]+)")
     LETTER_LIST_RE = re.compile(r"^[а-яёA-Za-z]\)\s?")
     JAP_IN_BRACKETS_RE = re.compile(rf"\(.*?[{JAP_LETTERS}].*?\)|\[{JAP_LETTERS}].*?\]")
+    # JAP_RE и LETTER_LIST_RE одним проходом: японский префикс, затем "а)"
+    SENSE_PREFIX_RE = re.compile(
+        rf"^(?:[^\s\w]*[\[\]\/{JAP_LETTERS}\s,]+)?(?:[а-яёA-Za-z]\)\s?)?", re.U
+    )
+    LIST_SPLIT_RE = re.compile(r"\d+[\.\)]:?\s*")
+    QUALIFIER_RE = re.compile(r"\s*\([а-яёА-ЯЁ]+\.\s*.+?\)\s*")
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -82,50 +88,57 @@ class ArticleParser:
 
         return ts
 
+    def split_senses(self, article: str) -> list[str]:
+        """Делит тело статьи на значения: по нумерации "1.", "2)" (если
+        в статье есть нумерованный список) и по ";" внутри пунктов."""
+        if not self.LIST_RE.search(article):
+            return article.split(";")
+
+        senses = []
+        for part in self.LIST_SPLIT_RE.split(article.strip()):
+            if part.strip():
+                senses.extend(
+                    item.strip(" ;\n") for item in part.strip(" ;\n").split(";")
+                )
+        return senses
+
+    def clean_sense(self, part: str) -> str:
+        """Текст значения без пояснения до двоеточия, японского префикса,
+        буквы списка и японского в скобках."""
+        part = part.partition(":")[-1].strip(" ;\n") or part.strip(" ;\n")
+        part = self.SENSE_PREFIX_RE.sub("", part, count=1)
+        return self.JAP_IN_BRACKETS_RE.sub("", part).strip(" .")
+
+    def iter_clean_senses(self, senses: list[str]) -> Iterator[str]:
+        """Очищенные значения по требованию: ``get_mainsense`` обычно
+        останавливается на первых двух-трёх."""
+        yield self.clean_sense(senses[0].strip("\n"))
+        for part in senses[1:]:
+            yield self.clean_sense(part.strip())
+
     def get_mainsense(self, article: str) -> str:
-        big_yarxi = self.BIG_YARXI_RE.search(article.split("\n")[0])
+        lines = article.split("\n")
+        big_yarxi = self.BIG_YARXI_RE.search(lines[0])
 
         if big_yarxi:
             self.logger.debug("большая статья яркси")
             self.logger.debug(big_yarxi)
             return big_yarxi.group(2)
 
-        lines = article.split("\n")
-
         if "2-я основа" in lines[0]:
             article = "\n".join(lines[3:])
 
         if "уст." in lines[0] or "сущ." in lines[0] or "ономат." in lines[0]:
             article = "\n".join(lines[1:])
 
-        art_contain_list = self.LIST_RE.search(article)
-
-        if art_contain_list:
-            senses = re.split(r"\d+[\.\)]:?\s*", article.strip())
-            senses = [p.strip(" ;\n") for p in senses if p.strip()]
-            senses = [item.strip(" ;\n") for s in senses for item in s.split(";")]
-        else:
-            senses = article.split(";")
-
-        part = senses[0].strip("\n")
-        result = part.partition(":")[-1].strip(" ;\n") or part.strip(" ;\n")
-        result = re.sub(self.JAP_RE, "", result)
-        result = re.sub(self.LETTER_LIST_RE, "", result)
-        result = re.sub(self.JAP_IN_BRACKETS_RE, "", result).strip(" .")
-        i = 1
-
-        while i < len(senses):
-            part = senses[i].strip()
-            part = part.partition(":")[-1].strip(" ;\n") or part.strip(" ;\n")
-            part = re.sub(self.JAP_RE, "", part)
-            part = re.sub(self.LETTER_LIST_RE, "", part)
-            part = re.sub(self.JAP_IN_BRACKETS_RE, "", part).strip(" .")
+        senses = self.iter_clean_senses(self.split_senses(article))
+        result = next(senses)
+        for part in senses:
             if len(result + part) > 25 or not part:
                 break
             result = result + ", " + part
-            i = i + 1
 
-        result = re.sub(r"\s*\([а-яёА-ЯЁ]+\.\s*.+?\)\s*", "", result).strip()
+        result = self.QUALIFIER_RE.sub("", result).strip()
 
         return (
             result
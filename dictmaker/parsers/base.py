@@ -1,9 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+from core.stages import StageCounter
 from models.models import Translation
 
 
+class ParseResult(NamedTuple):
+    index: int
+    wordcsv: List[str]
+    translations: Optional[List[Translation]]
+    # тексты подошедших слову статей, если парсер их отдаёт
+    articles: tuple[str, ...] = ()
+
+
 class BaseWordParser(ABC):
+    # откуда статьи, для raw_articles.source
+    source: str = "unknown"
+
     @abstractmethod
     def parse_article(self, wordcsv: List[str]) -> Optional[List[Translation]]:
         pass
+
+    def parse_articles(
+        self, words: Iterable[tuple[int, List[str]]]
+    ) -> Iterator[ParseResult]:
+        for index, wordcsv in words:
+            yield ParseResult(index, wordcsv, self.parse_article(wordcsv))
+
+    def stage_stats(self) -> list[StageCounter]:
+        """Счётчики стадий парсера для лога пропускной способности."""
+        return []
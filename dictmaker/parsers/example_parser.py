@@ -6,12 +6,14 @@ from typing import List
 from bs4 import BeautifulSoup
 import pykakasi
 
+from core.http_cache import CacheMiss, ResponseCache
 from models.models import Example
 
 
 class ExampleParser:
-    def __init__(self):
+    def __init__(self, cache: ResponseCache | None = None):
         self.logger = logging.getLogger(__name__)
+        self.cache = cache
 
         self.session = requests.Session()
         self.session.headers.update(
@@ -72,10 +74,14 @@ class ExampleParser:
         examples = []
 
         try:
-            response = self.session.get(tatoeba_url, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "html.parser")
+            if self.cache:
+                content = self.cache.fetch(
+                    tatoeba_url, lambda: self._download(tatoeba_url)
+                )
+            else:
+                content = self._download(tatoeba_url)
+
+            soup = BeautifulSoup(content, "html.parser")
             tab = soup.find(id="tabContent")
 
             if not tab:
@@ -98,6 +104,14 @@ class ExampleParser:
 
             return examples
 
+        except CacheMiss:
+            self.logger.debug(f"Tatoeba для '{word}' нет в кэше (offline)")
+            return []
         except Exception as e:
             self.logger.error(f"Ошибка при парсинге Tatoeba для '{word}': {e}")
             return []
+
+    def _download(self, url: str) -> bytes:
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        return response.content
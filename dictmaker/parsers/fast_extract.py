@@ -0,0 +1,113 @@
+"""Извлечение текста статей со страницы Jardic через lxml.
+
+Путь через BeautifulSoup(html.parser) + html2text разбирает страницу,
+сериализует каждую ячейку обратно в HTML (``str(td)``) и разбирает её
+ещё раз. Здесь страница разбирается один раз, а текст ячейки собирается
+обходом дерева: ``<br>`` - перенос строки, блочные теги - пустая строка,
+пробелы внутри текста схлопываются, как при отображении HTML.
+
+В отличие от html2text, текст получается таким же, как в Jardic Pro и
+в тестах ArticleParser: длинные строки не переносятся по 78 символов,
+"1." и "-" в начале строки не экранируются, ссылки - просто текст.
+"""
+
+import re
+
+import lxml.html
+from bs4 import UnicodeDammit
+from lxml import etree
+
+BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "blockquote",
+        "div",
+        "dl",
+        "dt",
+        "dd",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+        "li",
+        "ol",
+        "p",
+        "pre",
+        "ul",
+    }
+)
+SKIP_TAGS = frozenset({"script", "style", "head", "title"})
+
+_SPACES_RE = re.compile(r"[ \t\n\r\f\v]+")
+
+
+def parse_page(content: bytes) -> lxml.html.HtmlElement:
+    try:
+        markup = content.decode("utf-8")
+    except UnicodeDecodeError:
+        markup = UnicodeDammit(content, is_html=True).unicode_markup
+    return lxml.html.document_fromstring(markup)
+
+
+def render_text(element: lxml.html.HtmlElement) -> str:
+    """Текст элемента построчно: без разметки, с переносами по ``<br>``
+    и пустой строкой вокруг блочных тегов."""
+    parts: list[str] = []
+
+    def add(text: str | None) -> None:
+        if text:
+            parts.append(_SPACES_RE.sub(" ", text).replace("\xa0", " "))
+
+    def block_break() -> None:
+        # ровно одна пустая строка, даже если перед блоком был <br>
+        trailing = "".join(parts[-3:]).rstrip(" ")
+        if not trailing or trailing.endswith("\n\n"):
+            return
+        parts.append("\n" if trailing.endswith("\n") else "\n\n")
+
+    def walk(node) -> None:
+        for child in node:
+            tag = child.tag if isinstance(child.tag, str) else None
+            if tag == "br":
+                parts.append("\n")
+            elif tag in SKIP_TAGS or tag is None:
+                # комментарии и инструкции не выводятся, но текст после них - да
+                pass
+            elif tag in BLOCK_TAGS:
+                block_break()
+                add(child.text)
+                walk(child)
+                block_break()
+            else:
+                add(child.text)
+                walk(child)
+            add(child.tail)
+
+    add(element.text)
+    walk(element)
+    return "".join(parts)
+
+
+def extract_row_texts(content: bytes) -> list[str] | None:
+    """Тексты первых ячеек строк ``#tabContent`` или None, если таблицы
+    или строк на странице нет."""
+    try:
+        root = parse_page(content)
+    except etree.ParserError:
+        return None
+
+    tabs = root.xpath('//*[@id="tabContent"]')
+    if not tabs:
+        return None
+    rows = tabs[0].iter("tr")
+    texts = []
+    found = False
+    for row in rows:
+        found = True
+        td = next(row.iter("td"), None)
+        if td is not None:
+            texts.append(render_text(td))
+    return texts if found else None
@@ -1,9 +1,9 @@
 import logging
 
 from pywinauto.controls.uiawrapper import UIAWrapper
-from parsers.base import BaseWordParser
+from parsers.base import BaseWordParser, ParseResult
 from parsers.article_parser import ArticleParser
-from typing import List, override
+from typing import Iterable, Iterator, List, override
 from pywinauto import Application, WindowSpecification
 from pywinauto.controls.uia_controls import (
     ListViewWrapper,
@@ -18,6 +18,8 @@ from shared.regex import (
 
 
 class WordParserGUI(BaseWordParser):
+    source = "jardic_pro"
+
     def __init__(self, jardic_path: str):
         super().__init__()
 
@@ -55,6 +57,23 @@ class WordParserGUI(BaseWordParser):
 
     @override
     def parse_article(self, wordcsv: List[str]) -> List[Translation] | None:
+        return self.text_parser.process_results(self.read_articles(wordcsv))
+
+    @override
+    def parse_articles(
+        self, words: Iterable[tuple[int, List[str]]]
+    ) -> Iterator[ParseResult]:
+        for index, wordcsv in words:
+            articles = self.read_articles(wordcsv)
+            yield ParseResult(
+                index,
+                wordcsv,
+                self.text_parser.process_results(articles),
+                tuple(articles),
+            )
+
+    def read_articles(self, wordcsv: List[str]) -> List[str]:
+        """Тексты статей, подходящих слову, из окна Jardic."""
         word = wordcsv[0]
         kata = wordcsv[2]
 
@@ -106,7 +125,7 @@ class WordParserGUI(BaseWordParser):
                 results.append(current_article)
                 table_obj.type_keys("{VK_DOWN}")
 
-            return self.text_parser.process_results(results)
+            return results
 
         except Exception as e:
             self.logger.error(f"parse_word(): {e}")
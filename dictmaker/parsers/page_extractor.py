@@ -0,0 +1,153 @@
+import logging
+import signal
+import time
+from typing import List, NamedTuple
+
+import html2text
+from bs4 import BeautifulSoup
+
+from models.models import Translation
+from parsers.article_parser import ArticleParser
+from parsers.fast_extract import extract_row_texts
+
+BACKENDS = ("html2text", "lxml")
+
+
+class PageResult(NamedTuple):
+    translations: List[Translation] | None
+    articles: tuple[str, ...]
+    seconds: float
+
+
+class PageExtractor:
+    """Страница Jardic -> тексты подходящих статей -> переводы.
+
+    Не ходит в сеть и не хранит состояния между страницами, поэтому
+    работает и в дочерних процессах (``extract_page``). ``backend`` -
+    "html2text" (BeautifulSoup + html2text) или "lxml" (``fast_extract``).
+    """
+
+    def __init__(self, backend: str = "html2text"):
+        if backend not in BACKENDS:
+            raise ValueError(f"неизвестный backend разбора страниц: {backend}")
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend
+        self.text_parser = ArticleParser()
+
+        self.h2t = html2text.HTML2Text()
+        self.h2t.ignore_emphasis = True
+        self.h2t.ignore_tables = True
+
+    def row_texts(self, word: str, content: bytes) -> List[str] | None:
+        """Текст первой ячейки каждой строки ``#tabContent``."""
+        if self.backend == "lxml":
+            texts = extract_row_texts(content)
+            if texts is None:
+                self.logger.debug(f"No tabContent rows found for word: {word}")
+            return texts
+
+        soup = BeautifulSoup(content, "html.parser")
+        tab = soup.find(id="tabContent")
+
+        if not tab:
+            self.logger.debug(f"No tabContent found for word: {word}")
+            return None
+
+        rows = tab.select("tr")
+        if not rows:
+            self.logger.debug(f"No rows in tab for word: {word}")
+            return None
+
+        self.logger.debug(f"Found {len(rows)} rows inside tabContent for: {word}")
+
+        texts = []
+        for row in rows:
+            td = row.find("td") or row.select_one('td[id^="word-"]')
+            if td:
+                texts.append(self.h2t.handle(str(td)))
+        return texts
+
+    def extract_articles(
+        self, wordcsv: List[str], content: bytes | None
+    ) -> List[str] | None:
+        """Тексты статей страницы, подходящих слову."""
+        word = wordcsv[0]
+        katakana_reading = wordcsv[2]
+
+        if content is None:
+            return None
+
+        try:
+            texts = self.row_texts(word, content)
+            if texts is None:
+                return None
+
+            articles: List[str] = []
+
+            for text in texts:
+                if not text:
+                    continue
+
+                lines = [line.strip() for line in text.splitlines()]
+                cleaned_text = "\n".join(lines).strip()
+
+                if self.text_parser.is_article_correct(
+                    cleaned_text, word, katakana_reading
+                ):
+                    self.logger.debug(f"Matched correct article for: {word}")
+                    articles.append(cleaned_text)
+                else:
+                    self.logger.debug(
+                        f"Skipping article (incorrect match) for: {word} with reading: {katakana_reading}"
+                    )
+
+            return articles
+
+        except Exception as e:
+            self.logger.error(f"Error parsing word {word}: {e}")
+            return None
+
+    def process_articles(
+        self, word: str, articles: List[str] | None
+    ) -> List[Translation] | None:
+        if not articles:
+            return None
+
+        try:
+            translations = self.text_parser.process_results(articles)
+        except Exception as e:
+            self.logger.error(f"Error parsing word {word}: {e}")
+            return None
+
+        return translations if translations else None
+
+    def parse(self, wordcsv: List[str], content: bytes | None) -> PageResult:
+        start = time.perf_counter()
+        articles = self.extract_articles(wordcsv, content)
+        translations = self.process_articles(wordcsv[0], articles)
+        return PageResult(
+            translations, tuple(articles or ()), time.perf_counter() - start
+        )
+
+
+_extractor: PageExtractor | None = None
+
+
+def init_worker(log_level: int, backend: str = "html2text") -> None:
+    """Ctrl-C приходит всей группе процессов: воркеры его игнорируют,
+    а останавливает разбор обработчик в главном процессе, который успевает
+    сохранить уже разобранное."""
+    global _extractor
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=log_level)
+    _extractor = PageExtractor(backend)
+
+
+def extract_page(page: tuple[tuple[int, List[str]], bytes | None]) -> PageResult:
+    """``PageExtractor.parse`` для пула процессов: страница - это элемент
+    ``ConcurrentFetcher.map_ordered``, ((index, wordcsv), content)."""
+    global _extractor
+    if _extractor is None:
+        _extractor = PageExtractor()
+    (_, wordcsv), content = page
+    return _extractor.parse(wordcsv, content)
@@ -1,112 +1,131 @@
 import logging
-import html2text
+import threading
+import time
 import requests
 
-from parsers.base import BaseWordParser
+from concurrent.futures import ProcessPoolExecutor
+from core.fetcher import ConcurrentFetcher, HostRateLimiter
+from core.http_cache import CacheMiss, ResponseCache
+from core.stages import StageCounter, map_ordered
+from parsers.base import BaseWordParser, ParseResult
 from models.models import Translation
-from bs4 import BeautifulSoup, Tag, NavigableString
-from parsers.article_parser import ArticleParser
-from typing import List, override
+from parsers.page_extractor import PageExtractor, extract_page, init_worker
+from typing import Iterable, Iterator, List, override
 from parsers.example_parser import ExampleParser
+from shared.processes import pool_context
 
 
 class WordParser(BaseWordParser):
-    def __init__(self, jardic_url: str):
+    source = "jardic_web"
+
+    def __init__(
+        self,
+        jardic_url: str,
+        concurrency: int = 1,
+        rate_limit: float = 0,
+        max_in_flight: int | None = None,
+        cache: ResponseCache | None = None,
+        processes: int = 0,
+        html_backend: str = "html2text",
+    ):
         super().__init__()
         self.logger = logging.getLogger(__name__)
 
-        self.text_parser = ArticleParser()
+        # разбор страниц: в этом процессе или, при processes > 0, в пуле
+        self.extractor = PageExtractor(html_backend)
+        self.text_parser = self.extractor.text_parser
+        self.processes = processes
+        self.fetch_stats = StageCounter("загрузка")
+        self.extract_stats = StageCounter("разбор страниц")
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:151.0) Gecko/20100101 Firefox/151.0"
-            }
-        )
+        self._local = threading.local()
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.fetcher = ConcurrentFetcher(concurrency, max_in_flight)
+        self.cache = cache
 
-        self.example_parser = ExampleParser()
+        self.example_parser = ExampleParser(cache=cache)
 
         self.short_article_template = r"^[^\n]*\n\[[^\]]+\]$"
 
-        self.h2t = html2text.HTML2Text()
-        self.h2t.ignore_emphasis = True
-        self.h2t.ignore_tables = True
+        self.h2t = self.extractor.h2t
 
         self.jardic_url = jardic_url
 
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(
+                {
+                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:151.0) Gecko/20100101 Firefox/151.0"
+                }
+            )
+            self._local.session = session
+        return session
+
     @override
     def parse_article(self, wordcsv: List[str]) -> List[Translation] | None:
-        word = wordcsv[0]
-        katakana_reading = wordcsv[2]
-
-        try:
-            url = f"{self.jardic_url}?q={word}&pg=0&dic_jardic=1&dic_warodai=1&dic_yarxi=1&sw=1536"
-
-            response = self.session.get(url)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            tab = soup.find(id="tabContent")
-
-            if not tab:
-                self.logger.debug(f"No tabContent found for word: {word}")
-                return None
-
-            rows = tab.select("tr")
-            if not rows:
-                self.logger.debug(f"No rows in tab for word: {word}")
-                return None
-
-            self.logger.debug(f"Found {len(rows)} rows inside tabContent for: {word}")
-
-            translations_accumulated: List[Translation] = []
+        return self.parse_page(wordcsv, self.fetch_page(wordcsv[0]))
 
-            for row in rows:
-                td = row.find("td") or row.select_one('td[id^="word-"]')
-
-                if not td:
-                    continue
-
-                text = self.h2t.handle(str(td))
-
-                if not text:
-                    continue
+    @override
+    def parse_articles(
+        self, words: Iterable[tuple[int, List[str]]]
+    ) -> Iterator[ParseResult]:
+        pages = self.fetcher.map_ordered(self._fetch_item, words)
+        if self.processes < 1:
+            parsed = (
+                (page, self.extractor.parse(page[0][1], page[1])) for page in pages
+            )
+            yield from self._results(parsed)
+            return
+
+        with ProcessPoolExecutor(
+            self.processes,
+            mp_context=pool_context(),
+            initializer=init_worker,
+            initargs=(logging.getLogger().getEffectiveLevel(), self.extractor.backend),
+        ) as pool:
+            yield from self._results(
+                map_ordered(pool, extract_page, pages, 2 * self.processes)
+            )
 
-                lines = [line.strip() for line in text.splitlines()]
-                cleaned_text = "\n".join(lines).strip()
+    @override
+    def stage_stats(self) -> list[StageCounter]:
+        return [self.fetch_stats, self.extract_stats]
 
-                if self.text_parser.is_article_correct(
-                    cleaned_text, word, katakana_reading
-                ):
-                    self.logger.debug(f"Matched correct article for: {word}")
+    def _fetch_item(self, item: tuple[int, List[str]]) -> bytes | None:
+        start = time.perf_counter()
+        content = self.fetch_page(item[1][0])
+        self.fetch_stats.add(time.perf_counter() - start)
+        return content
 
-                    parsed_ts = self.text_parser.process_results([cleaned_text])
-                    if parsed_ts:
-                        translations_accumulated.extend(parsed_ts)
-                else:
-                    self.logger.debug(
-                        f"Skipping article (incorrect match) for: {word} with reading: {katakana_reading}"
-                    )
+    def _results(self, parsed) -> Iterator[ParseResult]:
+        for ((index, wordcsv), _), result in parsed:
+            self.extract_stats.add(result.seconds)
+            yield ParseResult(index, wordcsv, result.translations, result.articles)
 
-            return translations_accumulated if translations_accumulated else None
+    def fetch_page(self, word: str) -> bytes | None:
+        url = f"{self.jardic_url}?q={word}&pg=0&dic_jardic=1&dic_warodai=1&dic_yarxi=1&sw=1536"
 
+        try:
+            if self.cache:
+                return self.cache.fetch(url, lambda: self._download(url))
+            return self._download(url)
+        except CacheMiss:
+            self.logger.debug(f"Offline cache miss for word: {word}")
+            return None
         except Exception as e:
-            self.logger.error(f"Error parsing word {word}: {e}")
+            self.logger.error(f"Error fetching word {word}: {e}")
             return None
 
-    def _extract_rendered_text(self, element: Tag) -> str:
-        result: list[str] = []
-
-        for child in element.descendants:
-            if isinstance(child, NavigableString):
-                txt = child.strip()
-                if txt:
-                    result.append(txt)
-
-            elif isinstance(child, Tag):
-                if child.name == "br":
-                    result.append("\n")
+    def _download(self, url: str) -> bytes:
+        self.rate_limiter.wait(url)
+        response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        return response.content
 
-        text = " ".join(result)
-        text = text.replace("\n\n", "\n").strip()
-        return text
+    def parse_page(
+        self, wordcsv: List[str], content: bytes | None
+    ) -> List[Translation] | None:
+        return self.extractor.parse(wordcsv, content).translations
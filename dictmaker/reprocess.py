@@ -0,0 +1,31 @@
+"""Повторный разбор сохранённых статей без скачивания.
+
+После правки эвристик ArticleParser переводы пересобираются из таблицы
+raw_articles, которую заполняет main.py:
+
+    uv run --package dictmaker python dictmaker/reprocess.py
+"""
+
+import logging
+
+from shared.config import DICT_BATCH_SIZE, DICT_REPROCESS_PROCESSES
+from shared.database.db_session import init_db, get_session
+from core.reprocess import reprocess
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    init_db()
+
+    with get_session() as session:
+        stats = reprocess(
+            session, processes=DICT_REPROCESS_PROCESSES, batch_size=DICT_BATCH_SIZE
+        )
+    logging.info(f"Повторная обработка завершена: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+from shared.testing import db_session  # noqa: F401
@@ -0,0 +1,80 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def make_page(*articles: list[str]) -> str:
+    rows = "".join(
+        f'<tr><td id="word-{i}">{"<br>".join(lines)}</td></tr>'
+        for i, lines in enumerate(articles)
+    )
+    return f'<html><body><div id="tabContent"><table>{rows}</table></div></body></html>'
+
+
+PAGES = {
+    "構築": make_page(
+        ["こうちく", "構築", "сооружение, постройка, строительство;"],
+    ),
+    "彼": make_page(
+        ["かれ", "彼", "1) он; 2) разг. возлюбленный"],
+        ["かの", "彼の", "тот"],
+    ),
+    "これ": make_page(
+        ["これ", "此れ･是", "это"],
+    ),
+    "言う": make_page(
+        ["いう", "言う", "1. говорить; сказать, заметить; заявлять"],
+    ),
+}
+
+
+class JardicStub:
+    """Локальная замена search_r.php, отдающая заготовленные страницы."""
+
+    def __init__(self, pages: dict[str, str] = PAGES, delay: float = 0.0):
+        self.pages = pages
+        self.delay = delay
+        self.requests: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query)
+                word = query.get("q", [""])[0]
+                with stub._lock:
+                    stub.requests.append(word)
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    time.sleep(stub.delay)
+                finally:
+                    # до ответа: получив его, клиент сразу шлёт следующий запрос
+                    with stub._lock:
+                        stub.active -= 1
+                body = stub.pages.get(word, "<html><body></body></html>")
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/search_r.php"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "JardicStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -966,3 +966,13 @@ TN69757
     assert result.word == "館"
     assert result.reading == "やかた"
     assert result.mainsense == "дворец"
+
+
+def test_split_and_clean_senses(parser: ArticleParser):
+    article = "1. 見る: смотреть; глядеть\n2) а) видеть (見える);\n3.:"
+
+    senses = parser.split_senses(article)
+
+    assert senses == ["見る: смотреть", "глядеть", "а) видеть (見える)"]
+    assert list(parser.iter_clean_senses(senses)) == ["смотреть", "глядеть", "видеть"]
+    assert parser.split_senses("поле; равнина") == ["поле", " равнина"]
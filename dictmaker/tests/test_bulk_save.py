@@ -0,0 +1,57 @@
+from models.models import Example, Translation
+from shared.database.models import (
+    ExampleTable,
+    TranslationTable,
+    TranslationWordTable,
+)
+from shared.database.utils import get_by_word_and_reading, save_to_sqlite
+
+
+def make_translation(word: str, reading: str, mainsense: str = "-", examples=()):
+    return Translation(
+        word=word,
+        reading=reading,
+        mainsense=mainsense,
+        senses="-",
+        examples=list(examples),
+    )
+
+
+def test_duplicate_does_not_fail_batch(db_session):
+    save_to_sqlite([make_translation("彼", "かれ", "он")], db_session)
+    db_session.commit()
+
+    save_to_sqlite(
+        [
+            make_translation("彼", "かれ", "возлюбленный"),
+            make_translation("此れ･是", "これ"),
+            make_translation("此れ･是", "これ"),
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    assert db_session.query(TranslationTable).count() == 2
+    assert get_by_word_and_reading("彼", "かれ", db_session).mainsense == "он"
+    assert get_by_word_and_reading("是", "これ", db_session) is not None
+    assert db_session.query(TranslationWordTable).count() == 3
+
+
+def test_update_replaces_fields_and_examples(db_session):
+    example = Example(ja="彼が来た", re="かれがきた", tr="он пришёл")
+    save_to_sqlite([make_translation("彼", "かれ", "он", [example])], db_session)
+    db_session.commit()
+
+    new_example = Example(ja="彼の本", re="かれのほん", tr="его книга")
+    save_to_sqlite(
+        [make_translation("彼", "かれ", "возлюбленный", [new_example])],
+        db_session,
+        on_conflict="update",
+    )
+    db_session.commit()
+
+    translation = get_by_word_and_reading("彼", "かれ", db_session)
+    assert translation.mainsense == "возлюбленный"
+    assert [e.ja for e in translation.examples] == ["彼の本"]
+    assert db_session.query(ExampleTable).count() == 1
+    assert db_session.query(TranslationWordTable).count() == 1
@@ -0,0 +1,144 @@
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+from core.fetcher import ConcurrentFetcher, HostRateLimiter
+from core.processor import DictionaryProcessor
+from parsers.page_extractor import init_worker
+from parsers.word_parser import WordParser
+from shared.csv import WordRecord
+from shared.database.models import TranslationTable
+from shared.processes import pool_context
+from tests.jardic_stub import JardicStub
+
+
+@pytest.fixture
+def stub():
+    with JardicStub(delay=0.05) as server:
+        yield server
+
+
+def test_results_in_csv_order(stub: JardicStub):
+    parser = WordParser(stub.url, concurrency=4)
+    words = [
+        ["彼", "代名詞", "カレ"],
+        ["構築", "名詞", "コウチク"],
+        ["ない", "形容詞", "ナイ"],
+        ["これ", "代名詞", "コレ"],
+        ["言う", "動詞", "イウ"],
+    ]
+
+    results = list(parser.parse_articles(enumerate(words)))
+
+    assert [r.index for r in results] == [0, 1, 2, 3, 4]
+    assert [r.wordcsv[0] for r in results] == [w[0] for w in words]
+    assert [t.word for t in results[0].translations] == ["彼"]
+    assert results[1].translations[0].mainsense.startswith("сооружение")
+    assert results[2].translations is None
+    assert results[3].translations[0].word == "此れ･是"
+    assert results[4].translations[0].reading == "いう"
+    assert stub.max_active > 1
+
+
+def test_parse_stage_in_process_pool(stub: JardicStub, db_session):
+    records = [
+        WordRecord(word, "-", kata, 100 - i, i, "")
+        for i, (word, kata) in enumerate(
+            [("彼", "カレ"), ("構築", "コウチク"), ("ない", "ナイ"), ("言う", "イウ")]
+        )
+    ]
+
+    dictionaries = []
+    for processes in (0, 2):
+        parser = WordParser(stub.url, concurrency=4, processes=processes)
+        processor = DictionaryProcessor(parser=parser, session=db_session)
+        processor.batch_size = 100
+        processor.parse_words(records)
+        dictionaries.append([(t.word, t.index_csv) for t in processor.dictionary])
+
+        assert parser.fetch_stats.items == 4
+        assert parser.extract_stats.items == 4
+        assert processor.persist_stats.items == 4
+
+    assert dictionaries[0] == dictionaries[1]
+    assert dictionaries[0] == [("彼", 0), ("構築", 1), ("言う", 3)]
+
+
+def test_stop_mid_run_flushes_parsed_words(stub: JardicStub, db_session, monkeypatch):
+    records = [
+        WordRecord(word, "-", kata, 100 - i, i, "")
+        for i, (word, kata) in enumerate(
+            [("彼", "カレ"), ("構築", "コウチク"), ("これ", "コレ"), ("言う", "イウ")]
+        )
+    ]
+    parser = WordParser(stub.url, concurrency=1, processes=2)
+    processor = DictionaryProcessor(parser=parser, session=db_session)
+    keep_articles = processor._keep_articles
+
+    def keep_and_interrupt(*args):
+        keep_articles(*args)
+        os.kill(os.getpid(), signal.SIGINT)
+
+    monkeypatch.setattr(processor, "_keep_articles", keep_and_interrupt)
+    previous = signal.signal(signal.SIGINT, lambda signum, frame: processor.stop())
+    try:
+        processor.parse_words(records)
+    finally:
+        signal.signal(signal.SIGINT, previous)
+    processor.flush()
+
+    saved = db_session.scalars(select(TranslationTable.word)).all()
+    assert saved == ["彼"]
+
+
+def test_parse_workers_ignore_sigint():
+    with ProcessPoolExecutor(
+        1, mp_context=pool_context(), initializer=init_worker, initargs=(0,)
+    ) as pool:
+        handler = pool.submit(signal.getsignal, signal.SIGINT).result()
+
+    assert handler == signal.SIG_IGN
+
+
+def test_concurrency_limit(stub: JardicStub):
+    parser = WordParser(stub.url, concurrency=2, max_in_flight=8)
+    words = [["構築", "名詞", "コウチク"]] * 8
+
+    list(parser.parse_articles(enumerate(words)))
+
+    assert len(stub.requests) == 8
+    assert stub.max_active <= 2
+
+
+def test_in_flight_is_bounded():
+    pulled = []
+
+    def items():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    fetcher = ConcurrentFetcher(concurrency=2, max_in_flight=4)
+    results = fetcher.map_ordered(lambda x: x * 2, items())
+
+    assert next(results) == (0, 0)
+    assert len(pulled) == 4
+
+    results.close()
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(rate=20)
+
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait("http://a.example/search")
+    limiter.wait("http://b.example/search")
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.19
+    assert elapsed < 0.5
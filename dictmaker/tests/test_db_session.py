@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from shared.database.db_session import create_sqlite_engine
+from shared.database.models import Base
+
+
+def test_wal_profile_pragmas(tmp_path):
+    engine = create_sqlite_engine(tmp_path / "dict.db", profile="wal")
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2
+
+    engine.dispose()
+
+
+def test_read_only_engine_rejects_writes(tmp_path):
+    path = tmp_path / "dict.db"
+    engine = create_sqlite_engine(path, profile="wal")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    readonly = create_sqlite_engine(path, profile="wal", read_only=True)
+    with readonly.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM translations")).scalar() == 0
+        with pytest.raises(OperationalError):
+            conn.execute(text("DELETE FROM translations"))
+
+    readonly.dispose()
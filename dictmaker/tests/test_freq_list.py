@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import insert
+
+import shared.csv
+from shared.csv import WordRecord, iter_words
+from shared.database.migrations import remap_index_csv
+from shared.freq_index import compile_freq_index, load_freq_index
+from shared.database.models import TranslationTable
+
+CSV = """、,記号,、,"55,670,259 "
+の,助詞,ノ,"50,267,639 "
+いる,動詞-非自立,イル,"11,403,947 "
+こと,名詞,コト,"9,542,483 "
+東京【とうきょう】,名詞,トウキョウ,"1,000 "
+言う,動詞,イウ,"8,000,000 "
+難い,形容詞,カタイ"19,"483 "
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    path = tmp_path / "freq_list.csv"
+    path.write_text(CSV, encoding="utf-8")
+    monkeypatch.setattr(shared.csv, "CSV_PATH", path)
+    return path
+
+
+def test_records_keep_row_index(csv_path):
+    records = list(iter_words())
+
+    assert records == [
+        WordRecord("いる", "動詞-非自立", "イル", 11403947, 2, "いる"),
+        WordRecord("こと", "名詞", "コト", 9542483, 3, "こと"),
+        WordRecord("言う", "動詞", "イウ", 8000000, 5, "いう"),
+        WordRecord("難い", "形容詞", 'カタイ"19', 483, 6, 'かたい"19'),
+    ]
+    assert records[2][:3] == ("言う", "動詞", "イウ")
+
+
+def test_range_is_over_filtered_words(csv_path):
+    assert [r.word for r in iter_words(1, 3)] == ["こと", "言う"]
+    assert [r.index for r in iter_words(pos_filter=lambda pos: True)] == [
+        0,
+        1,
+        2,
+        3,
+        5,
+        6,
+    ]
+    assert list(iter_words(2, 2)) == []
+
+
+def test_stops_reading_when_range_is_satisfied(csv_path):
+    seen = []
+
+    def pos_filter(pos: str) -> bool:
+        seen.append(pos)
+        return pos == "名詞"
+
+    assert [r.word for r in iter_words(stop=1, pos_filter=pos_filter)] == ["こと"]
+    assert len(seen) == 4
+
+
+def test_compiled_index_matches_csv(csv_path):
+    from_csv = list(iter_words())
+    filtered_csv = list(iter_words(1, 3, pos_filter=lambda pos: pos != "名詞"))
+
+    compile_freq_index(csv_path)
+
+    assert load_freq_index(csv_path) is not None
+    assert list(iter_words()) == from_csv
+    assert list(iter_words(1, 3)) == from_csv[1:3]
+    assert list(iter_words(1, 3, pos_filter=lambda pos: pos != "名詞")) == (
+        filtered_csv
+    )
+
+
+def test_stale_index_is_ignored(csv_path):
+    compile_freq_index(csv_path)
+    csv_path.write_text(CSV + '彼,代名詞,カレ,"100 "\n', encoding="utf-8")
+
+    assert load_freq_index(csv_path) is None
+    assert list(iter_words())[-1].word == "彼"
+
+
+def test_migration_remaps_filtered_positions(csv_path, db_session):
+    db_session.execute(
+        insert(TranslationTable),
+        [
+            {"word": w, "reading": w, "mainsense": "-", "senses": "-", "index_csv": i}
+            for i, w in enumerate(["いる", "こと", "言う"])
+        ],
+    )
+    remap_index_csv(db_session)
+    db_session.commit()
+
+    rows = db_session.query(TranslationTable.word, TranslationTable.index_csv)
+    assert dict(rows.all()) == {"いる": 2, "こと": 3, "言う": 5}
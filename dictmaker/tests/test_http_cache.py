@@ -0,0 +1,62 @@
+import os
+import time
+
+import pytest
+
+from core.http_cache import CacheMiss, ResponseCache
+from parsers.word_parser import WordParser
+from tests.jardic_stub import JardicStub
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "http_cache.db"
+
+
+def test_key_ignores_param_order():
+    a = ResponseCache.make_key("http://x/s.php?q=彼&dic_jardic=1&dic_yarxi=1")
+    b = ResponseCache.make_key("http://X/s.php?dic_yarxi=1&q=彼&dic_jardic=1")
+    c = ResponseCache.make_key("http://x/s.php?q=彼&dic_jardic=1")
+
+    assert a == b
+    assert a != c
+
+
+def test_roundtrip_and_ttl(cache_path):
+    cache = ResponseCache(cache_path, ttl=0.05)
+    cache.put("http://x/?q=1", "страница".encode())
+
+    assert cache.get("http://x/?q=1") == "страница".encode()
+
+    time.sleep(0.1)
+
+    assert cache.get("http://x/?q=1") is None
+    assert ResponseCache(cache_path, offline=True).get("http://x/?q=1") is not None
+
+
+def test_size_bounded_eviction(cache_path):
+    cache = ResponseCache(cache_path, max_bytes=3000)
+    for i in range(10):
+        cache.put(f"http://x/?q={i}", os.urandom(1000))
+
+    assert cache.get("http://x/?q=0") is None
+    assert cache.get("http://x/?q=9") is not None
+    assert cache._total <= 3000
+
+
+def test_offline_replay(cache_path):
+    words = [["構築", "名詞", "コウチク"], ["彼", "代名詞", "カレ"]]
+
+    with JardicStub() as stub:
+        online = WordParser(stub.url, cache=ResponseCache(cache_path))
+        expected = list(online.parse_articles(enumerate(words)))
+
+    offline = WordParser(stub.url, cache=ResponseCache(cache_path, offline=True))
+    replayed = list(offline.parse_articles(enumerate(words)))
+
+    assert len(stub.requests) == 2
+    assert replayed == expected
+    assert offline.parse_article(["これ", "代名詞", "コレ"]) is None
+
+    with pytest.raises(CacheMiss):
+        offline.cache.fetch("http://x/?q=missing", lambda: b"")
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+from parsers.fast_extract import extract_row_texts
+from parsers.page_extractor import PageExtractor
+from tests.jardic_stub import PAGES
+
+PAGES_DIR = Path(__file__).parent / "pages"
+GOLDEN_SEP = "\n====\n"
+
+
+def cleaned(texts: list[str]) -> list[str]:
+    return ["\n".join(line.strip() for line in t.splitlines()).strip() for t in texts]
+
+
+@pytest.mark.parametrize(
+    "page", sorted(PAGES_DIR.glob("*.html")), ids=lambda path: path.stem
+)
+def test_lxml_rows_match_golden(page: Path):
+    golden = page.with_suffix(".txt").read_text(encoding="utf-8")
+
+    texts = extract_row_texts(page.read_bytes())
+
+    assert GOLDEN_SEP.join(cleaned(texts)) + "\n" == golden
+
+
+@pytest.mark.parametrize("word", ["構築", "彼", "これ"])
+def test_backends_agree_on_plain_articles(word: str):
+    content = PAGES[word].encode("utf-8")
+
+    assert cleaned(PageExtractor("lxml").row_texts(word, content)) == cleaned(
+        PageExtractor("html2text").row_texts(word, content)
+    )
+
+
+IU_MAINSENSES = [
+    "говорить, сказать, заметить",
+    "говорить, сказать, произносить, выговаривать, высказывать, "
+    "утверждать, заявлять, упоминать",
+]
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        "lxml",
+        pytest.param(
+            "html2text",
+            marks=pytest.mark.xfail(
+                reason='html2text экранирует "1." и переносит строки длиннее 78 символов',
+                strict=True,
+            ),
+        ),
+    ],
+)
+def test_numbered_lists_and_long_lines(backend: str):
+    content = (PAGES_DIR / "jardic_iu.html").read_bytes()
+    wordcsv = ["言う", "動詞", "イウ"]
+
+    translations = PageExtractor(backend).parse(wordcsv, content).translations
+
+    assert [t.mainsense for t in translations] == IU_MAINSENSES
+
+
+def test_lxml_without_tab_content():
+    assert extract_row_texts(b"<html><body><p>nothing</p></body></html>") is None
+    assert extract_row_texts(b'<div id="tabContent"></div>') is None
+    assert extract_row_texts(b"") is None
@@ -0,0 +1,75 @@
+from sqlalchemy import event
+
+from core.processor import DictionaryProcessor
+from models.models import Translation
+from parsers.base import BaseWordParser
+from shared.csv import WordRecord
+from shared.database.utils import add_not_found, save_to_sqlite
+
+
+class StubParser(BaseWordParser):
+    def __init__(self, articles: dict[str, list[Translation]]):
+        self.articles = articles
+        self.calls: list[str] = []
+
+    def parse_article(self, wordcsv):
+        self.calls.append(wordcsv[0])
+        return self.articles.get(wordcsv[0], [])
+
+
+def make_translation(word: str, reading: str, index_csv: int | None = None):
+    return Translation(
+        word=word, reading=reading, mainsense="-", senses="-", index_csv=index_csv
+    )
+
+
+def test_is_word_parsed_uses_preloaded_index(db_session):
+    save_to_sqlite(
+        [
+            make_translation("言う･云う", "いう", 5),
+            make_translation("此れ", "これ・こり", None),
+            make_translation("…等", "…ら", None),
+        ],
+        db_session,
+    )
+    add_not_found("無い", "ナイ", db_session)
+    db_session.commit()
+
+    processor = DictionaryProcessor(parser=StubParser({}), session=db_session)
+
+    statements = []
+    event.listen(
+        db_session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    assert processor.is_word_parsed("何か", "ナニカ", 5)
+    assert processor.is_word_parsed("云う", "イウ", 0)
+    assert not processor.is_word_parsed("言", "イウ", 0)
+    assert processor.is_word_parsed("これ", "コレ", 0)
+    assert processor.is_word_parsed("こり", "コリ", 0)
+    assert processor.is_word_parsed("ら", "ラ", 0)
+    assert not processor.is_word_parsed("これら", "コレラ", 0)
+    assert processor.is_word_parsed("無い", "ナイ", 0)
+    assert statements == []
+
+
+def test_index_updated_after_batch_save(db_session):
+    parser = StubParser({"言う": [make_translation("言う", "いう")]})
+    processor = DictionaryProcessor(parser=parser, session=db_session)
+
+    processor.parse_words(
+        [
+            WordRecord("言う", "動詞", "イウ", 100, 10, "いう"),
+            WordRecord("無い", "形容詞", "ナイ", 90, 11, "ない"),
+            WordRecord("言う", "動詞", "イウ", 80, 12, "いう"),
+        ]
+    )
+    processor._save_batch()
+
+    assert parser.calls == ["言う", "無い", "言う"]
+    assert processor.is_word_parsed("言う", "イウ", 0)
+    assert processor.is_word_parsed("無い", "ナイ", 0)
+    assert 10 in processor.lookup.indexes
+    assert processor.dictionary == []
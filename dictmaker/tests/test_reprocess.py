@@ -0,0 +1,189 @@
+from sqlalchemy import select
+
+from core.processor import DictionaryProcessor
+from core.reprocess import reprocess
+from models.models import Translation
+from parsers.word_parser import WordParser
+from shared.csv import WordRecord
+from shared.database.models import RawArticleTable, TranslationTable
+from shared.database.utils import save_raw_articles, save_to_sqlite
+from tests.jardic_stub import JardicStub
+
+
+def raw_article(word: str, reading: str, index: int, text: str, position: int = 0):
+    return {
+        "source": "jardic_web",
+        "query_word": word,
+        "query_reading": reading,
+        "index_csv": index,
+        "position": position,
+        "text": text,
+    }
+
+
+def translations(session) -> list[tuple]:
+    return session.execute(
+        select(
+            TranslationTable.word,
+            TranslationTable.reading,
+            TranslationTable.mainsense,
+            TranslationTable.index_csv,
+        ).order_by(TranslationTable.word)
+    ).all()
+
+
+def test_processor_keeps_raw_articles(db_session):
+    with JardicStub() as stub:
+        processor = DictionaryProcessor(
+            parser=WordParser(stub.url, concurrency=2), session=db_session
+        )
+        processor.parse_words(
+            [
+                WordRecord("彼", "代名詞", "カレ", 100, 3, "かれ"),
+                WordRecord("ない", "形容詞", "ナイ", 90, 4, "ない"),
+            ]
+        )
+        processor.flush()
+
+    rows = db_session.execute(
+        select(
+            RawArticleTable.source,
+            RawArticleTable.query_word,
+            RawArticleTable.index_csv,
+            RawArticleTable.position,
+            RawArticleTable.text,
+        )
+    ).all()
+    assert rows == [
+        ("jardic_web", "彼", 3, 0, "かれ\n彼\n1) он; 2) разг. возлюбленный")
+    ]
+
+
+def test_reprocess_rewrites_translations_of_stored_words(db_session):
+    save_to_sqlite(
+        [
+            Translation(
+                word="構築",
+                reading="こうちく",
+                mainsense="old",
+                senses="-",
+                index_csv=1,
+            ),
+            Translation(
+                word="野", reading="の", mainsense="поле", senses="-", index_csv=2
+            ),
+        ],
+        db_session,
+    )
+    save_raw_articles(
+        [
+            raw_article("構築", "コウチク", 1, "こうちく\n構築\nсооружение; постройка"),
+            raw_article("言う", "イウ", 3, "いう\n言う\n1. говорить; сказать"),
+            raw_article("言う", "イウ", 3, "いう\n言う\nсм. 云う", position=1),
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    stats = reprocess(db_session, chunk_size=2)
+
+    assert stats.articles == 3
+    assert stats.translations == 2
+    assert stats.deleted == 1
+    assert translations(db_session) == [
+        ("構築", "こうちく", "сооружение, постройка", 1),
+        ("言う", "いう", "говорить, сказать", 3),
+        ("野", "の", "поле", 2),
+    ]
+
+
+def test_reprocess_in_pool_matches_inline(db_session):
+    save_raw_articles(
+        [
+            raw_article(str(i), "ア", i, f"あ\n{word}\nслово {i}; другое")
+            for i, word in enumerate(["亜", "阿", "唖", "娃", "愛"])
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    reprocess(db_session, chunk_size=2)
+    inline = translations(db_session)
+    stats = reprocess(db_session, processes=2, chunk_size=2)
+
+    assert stats.deleted == 5
+    assert translations(db_session) == inline
+
+
+def test_reprocess_keeps_translations_of_broken_articles(db_session):
+    save_to_sqlite(
+        [
+            Translation(
+                word="構築",
+                reading="こうちく",
+                mainsense="old",
+                senses="-",
+                index_csv=1,
+            ),
+            Translation(
+                word="彼", reading="かれ", mainsense="old", senses="-", index_csv=2
+            ),
+        ],
+        db_session,
+    )
+    save_raw_articles(
+        [
+            raw_article("構築", "コウチク", 1, "сломанная статья"),
+            raw_article("彼", "カレ", 2, "かれ\n彼\nон"),
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    stats = reprocess(db_session)
+
+    assert stats.failed == 1
+    assert stats.deleted == 1
+    assert translations(db_session) == [
+        ("彼", "かれ", "он", 2),
+        ("構築", "こうちく", "old", 1),
+    ]
+
+
+def test_reprocess_dedups_variants_across_word_articles(db_session):
+    save_raw_articles(
+        [
+            raw_article("彼", "カレ", 2, "かれ\n彼･彼れ\nон"),
+            raw_article("彼", "カレ", 2, "かれ\n彼\nон; она", position=1),
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    stats = reprocess(db_session)
+
+    assert stats.articles == 2
+    assert stats.translations == 1
+    assert translations(db_session) == [("彼･彼れ", "かれ", "он", 2)]
+
+
+def test_save_raw_articles_replaces_all_articles_of_word(db_session):
+    save_raw_articles(
+        [
+            raw_article("言う", "イウ", 3, "いう\n言う\nговорить"),
+            raw_article("言う", "イウ", 3, "いう\n言う\nсм. 云う", position=1),
+            raw_article("彼", "カレ", 2, "かれ\n彼\nон"),
+        ],
+        db_session,
+    )
+    save_raw_articles(
+        [raw_article("言う", "イウ", 3, "いう\n言う\nсказать")], db_session
+    )
+    db_session.commit()
+
+    rows = db_session.execute(
+        select(RawArticleTable.query_word, RawArticleTable.text).order_by(
+            RawArticleTable.query_word
+        )
+    ).all()
+    assert rows == [("彼", "かれ\n彼\nон"), ("言う", "いう\n言う\nсказать")]
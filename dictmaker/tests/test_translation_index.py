@@ -0,0 +1,50 @@
+from models.models import Translation
+from shared.database.utils import (
+    get_by_reading,
+    get_by_word_and_reading,
+    load_translation_index,
+    save_to_sqlite,
+)
+
+
+def make_translation(word: str, reading: str, index_csv: int | None = None):
+    return Translation(
+        word=word, reading=reading, mainsense="-", senses="-", index_csv=index_csv
+    )
+
+
+def test_index_answers_like_sql_lookups(db_session):
+    save_to_sqlite(
+        [
+            make_translation("此れ", "これ", 1),
+            make_translation("是", "これ・ここ", 2),
+            make_translation("此処", "ここ ・ こっち"),
+            make_translation("言う･云う", "いう"),
+            make_translation("言う", "ゆう"),
+            make_translation("これ", "これ"),
+            make_translation("此", "これ"),
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    index = load_translation_index(db_session, chunk_size=2)
+    assert len(index) == 7
+
+    for word, reading in [
+        ("言う", "いう"),
+        ("云う", "いう"),
+        ("言う", "ゆう"),
+        ("此れ", "これ"),
+        ("是", "これ"),
+        ("無い", "ない"),
+    ]:
+        expected = get_by_word_and_reading(word, reading, db_session)
+        found = index.by_word_and_reading(word, reading)
+        assert (found and found.id) == (expected and expected.id)
+
+    for reading in ["これ", "ここ", "こっち", "いう", "こ"]:
+        expected = [t.id for t in get_by_reading(reading, session=db_session)]
+        assert [t.id for t in index.by_reading(reading)] == expected
+
+    assert index.by_word_and_reading("此れ", "これ").index_csv == 1
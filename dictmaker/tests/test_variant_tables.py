@@ -0,0 +1,101 @@
+from sqlalchemy import insert, text
+
+from models.models import Translation
+from shared.database.migrations import MIGRATIONS, migrate
+from shared.database.models import (
+    TranslationReadingTable,
+    TranslationTable,
+    TranslationWordTable,
+)
+from shared.database.utils import (
+    get_by_reading,
+    get_by_word_and_reading,
+    save_to_sqlite,
+)
+
+
+def make_translation(word: str, reading: str):
+    return Translation(word=word, reading=reading, mainsense="-", senses="-")
+
+
+def test_save_populates_variants(db_session):
+    save_to_sqlite([make_translation("言う･云う", "いう・ゆう")], db_session)
+    db_session.commit()
+
+    words = {w for (w,) in db_session.query(TranslationWordTable.word)}
+    readings = {r for (r,) in db_session.query(TranslationReadingTable.reading)}
+
+    assert words == {"言う", "云う"}
+    assert readings == {"いう", "ゆう"}
+
+
+def test_get_by_reading_matches_variants(db_session):
+    save_to_sqlite(
+        [
+            make_translation("此れ", "これ"),
+            make_translation("是", "これ・ここ"),
+            make_translation("此処", "ここ ・ こっち"),
+            make_translation("これら", "これら"),
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    assert [t.word for t in get_by_reading("これ", session=db_session)] == [
+        "此れ",
+        "是",
+    ]
+    assert [t.word for t in get_by_reading("ここ", session=db_session)] == [
+        "是",
+        "此処",
+    ]
+    assert [t.word for t in get_by_reading("こっち", session=db_session)] == ["此処"]
+    assert get_by_reading("こ", session=db_session) == []
+
+
+def test_migration_backfills_existing_rows(db_session):
+    db_session.execute(
+        insert(TranslationTable),
+        [
+            {"word": "彼･彼れ", "reading": "かれ", "mainsense": "-", "senses": "-"},
+            {
+                "word": "彼方",
+                "reading": "あちら・あっち",
+                "mainsense": "-",
+                "senses": "-",
+            },
+        ],
+    )
+    db_session.commit()
+
+    engine = db_session.get_bind()
+    migrate(engine)
+
+    assert db_session.execute(text("PRAGMA user_version")).scalar() == MIGRATIONS[-1][0]
+    assert db_session.query(TranslationWordTable).count() == 3
+    assert [t.word for t in get_by_reading("あっち", session=db_session)] == ["彼方"]
+
+
+def test_get_by_word_and_reading_matches_whole_variants(db_session):
+    save_to_sqlite(
+        [
+            make_translation("大学生", "だいがくせい"),
+            make_translation("言う･云う", "いう"),
+            make_translation("此れ, 是", "これ"),
+            make_translation("大", "だい"),
+        ],
+        db_session,
+    )
+    db_session.commit()
+
+    def lookup(word: str, reading: str) -> str | None:
+        found = get_by_word_and_reading(word, reading, db_session)
+        return found.word if found else None
+
+    assert lookup("云う", "いう") == "言う･云う"
+    assert lookup("言う", "いう") == "言う･云う"
+    assert lookup("是", "これ") == "此れ, 是"
+    assert lookup("大", "だい") == "大"
+    assert lookup("大学", "だいがく") is None
+    assert lookup("言", "いう") is None
+    assert lookup("云う", "ゆう") is None
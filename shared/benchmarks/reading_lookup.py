@@ -0,0 +1,102 @@
+"""Сравнение поиска по чтению: старые LIKE шаблоны и таблица translation_readings.
+
+Запуск:
+    uv run --package shared python shared/benchmarks/reading_lookup.py [rows]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert, or_
+from sqlalchemy.orm import Session
+
+from shared.database.migrations import migrate
+from shared.database.models import Base, TranslationTable
+from shared.database.utils import get_by_reading
+
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわん"
+
+
+def legacy_get_by_reading(
+    reading: str, session: Session, limit: int = 3
+) -> list[TranslationTable]:
+    query_filter = or_(
+        TranslationTable.reading == reading,
+        TranslationTable.reading.like(f"{reading}・%"),
+        TranslationTable.reading.like(f"%・{reading}"),
+        TranslationTable.reading.like(f"%・{reading}・%"),
+        TranslationTable.reading.like(f"{reading} ・%"),
+        TranslationTable.reading.like(f"%・ {reading}"),
+        TranslationTable.reading.like(f"%・ {reading} ・%"),
+    )
+    return session.query(TranslationTable).filter(query_filter).limit(limit).all()
+
+
+def random_reading(rng: random.Random) -> str:
+    return "".join(rng.choice(KANA) for _ in range(rng.randint(2, 6)))
+
+
+def build_db(path: Path, rows: int, rng: random.Random) -> list[str]:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    readings = []
+    values = []
+    for i in range(rows):
+        parts = [random_reading(rng) for _ in range(rng.choice((1, 1, 1, 2, 3)))]
+        readings.extend(parts)
+        values.append(
+            {
+                "word": f"語{i}",
+                "reading": "・".join(parts),
+                "mainsense": "-",
+                "senses": "-",
+            }
+        )
+
+    with Session(engine) as session:
+        session.execute(insert(TranslationTable), values)
+        session.commit()
+
+    start = time.perf_counter()
+    migrate(engine)
+    print(f"Миграция (заполнение вариантов): {time.perf_counter() - start:.2f} с")
+
+    engine.dispose()
+    return readings
+
+
+def measure(name: str, lookup, queries: list[str], session: Session) -> None:
+    start = time.perf_counter()
+    found = sum(1 for q in queries if lookup(q, session=session))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:>8}: {len(queries) / elapsed:10.1f} запросов/с, "
+        f"{elapsed / len(queries) * 1000:.3f} мс/запрос, найдено {found}"
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        readings = build_db(path, rows, rng)
+
+        queries = rng.sample(readings, 500) + [random_reading(rng) for _ in range(500)]
+        rng.shuffle(queries)
+
+        engine = create_engine(f"sqlite:///{path}")
+        with Session(engine) as session:
+            print(f"Строк: {rows}, запросов: {len(queries)}")
+            measure("LIKE", legacy_get_by_reading, queries, session)
+            measure("join", get_by_reading, queries, session)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
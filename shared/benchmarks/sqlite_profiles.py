@@ -0,0 +1,91 @@
+"""Пропускная способность вставки и поиска для профилей SQLite из db_session.
+
+Запуск:
+    uv run --package shared python shared/benchmarks/sqlite_profiles.py [rows] [batch]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy.orm import Session
+
+from shared.database.db_session import SQLITE_PROFILES, create_sqlite_engine
+from shared.database.models import Base
+from shared.database.utils import (
+    get_by_reading,
+    get_by_word_and_reading,
+    save_to_sqlite,
+)
+
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわん"
+
+
+def make_items(rows: int, rng: random.Random) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            word=f"語{i}",
+            reading="".join(rng.choice(KANA) for _ in range(rng.randint(2, 6))),
+            mainsense="перевод",
+            senses="1. перевод; 2. значение",
+            index_csv=i,
+            examples=[],
+        )
+        for i in range(rows)
+    ]
+
+
+def bench_profile(
+    path: Path, profile: str, items: list[SimpleNamespace], batch: int
+) -> None:
+    engine = create_sqlite_engine(path, profile=profile)
+    Base.metadata.create_all(engine)
+
+    start = time.perf_counter()
+    with Session(engine) as session:
+        for i in range(0, len(items), batch):
+            save_to_sqlite(items[i : i + batch], session)
+            session.commit()
+    insert_rate = len(items) / (time.perf_counter() - start)
+
+    queries = random.Random(1).sample(items, min(2000, len(items)))
+
+    start = time.perf_counter()
+    with Session(engine) as session:
+        for item in queries:
+            get_by_word_and_reading(item.word, item.reading, session)
+            get_by_reading(item.reading, session=session)
+    lookup_rate = len(queries) / (time.perf_counter() - start)
+    engine.dispose()
+
+    readonly = create_sqlite_engine(path, profile=profile, read_only=True)
+    start = time.perf_counter()
+    with Session(readonly) as session:
+        for item in queries:
+            get_by_word_and_reading(item.word, item.reading, session)
+            get_by_reading(item.reading, session=session)
+    readonly_rate = len(queries) / (time.perf_counter() - start)
+    readonly.dispose()
+
+    print(
+        f"{profile:>8}: вставка {insert_rate:9.0f} строк/с, "
+        f"поиск {lookup_rate:7.0f} слов/с, read-only {readonly_rate:7.0f} слов/с"
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    items = make_items(rows, random.Random(42))
+
+    print(f"Строк: {rows}, батч: {batch}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in SQLITE_PROFILES:
+            bench_profile(Path(tmp) / f"{profile}.db", profile, items, batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+
+class AudioEntry(NamedTuple):
+    """Сведения о готовом mp3. ``speaker``/``accent`` равны None у файлов,
+    найденных на диске без записи об озвучке (старые прогоны)."""
+
+    filename: str
+    size: int
+    mtime_ns: int
+    duration: float | None
+    sha256: str | None
+    speaker: int | None
+    accent: int | None
+
+
+class AudioManifest:
+    """Реестр озвученных файлов в TTS_OUTPUT_FOLDER.
+
+    tts пишет сюда каждый экспортированный mp3 вместе с голосом и ударением,
+    а ``reconcile`` одним проходом ``os.scandir`` сверяет реестр с папкой:
+    удалённые файлы забываются, новые и изменённые - переучитываются. После
+    этого "есть ли аудио" и "устарело ли оно" - это поиск в словаре, без
+    ``os.path.exists`` на каждое слово.
+    """
+
+    def __init__(self, path: Path | str, folder: Path | str):
+        self.logger = logging.getLogger(__name__)
+        self.folder = Path(folder)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS audio (
+                filename TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                duration REAL,
+                sha256 TEXT,
+                speaker INTEGER,
+                accent INTEGER,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self.entries: dict[str, AudioEntry] = {
+            row[0]: AudioEntry(*row)
+            for row in self._conn.execute(
+                "SELECT filename, size, mtime_ns, duration, sha256, speaker, accent "
+                "FROM audio"
+            )
+        }
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.entries
+
+    def get(self, filename: str) -> AudioEntry | None:
+        return self.entries.get(filename)
+
+    def is_stale(self, filename: str, speaker: int, accent: int) -> bool:
+        """Нужно ли (пере)озвучить слово: файла нет, либо он записан другим
+        голосом или с другим ударением. Файлы без сведений об озвучке
+        считаются актуальными, чтобы не переозвучивать весь старый корпус."""
+        entry = self.entries.get(filename)
+        if entry is None:
+            return True
+        if entry.speaker is not None and entry.speaker != speaker:
+            return True
+        return entry.accent is not None and entry.accent != accent
+
+    def record(self, entries: Iterable[AudioEntry]) -> None:
+        entries = list(entries)
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO audio "
+            "(filename, size, mtime_ns, duration, sha256, speaker, accent, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(*entry, now) for entry in entries],
+        )
+        self._conn.commit()
+        for entry in entries:
+            self.entries[entry.filename] = entry
+
+    def _hash_file(self, filename: str) -> AudioEntry | None:
+        try:
+            with open(self.folder / filename, "rb") as f:
+                sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+                stat = os.fstat(f.fileno())
+        except FileNotFoundError:
+            return None
+        entry = self.entries.get(filename)
+        if entry is None or (entry.size, entry.mtime_ns) != (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            entry = AudioEntry(filename, stat.st_size, stat.st_mtime_ns, *[None] * 4)
+        return entry._replace(sha256=sha256)
+
+    def checksums(self, filenames: Iterable[str], workers: int = 8) -> dict[str, str]:
+        """sha256 файлов. Хэши берутся из реестра; недостающие (файлы,
+        найденные ``reconcile``) считаются в пуле потоков и сохраняются,
+        так что неизменённое аудио между сборками не перечитывается.
+        Файлов, которых нет на диске, в результате нет."""
+        result = {}
+        missing = []
+        for filename in set(filenames):
+            entry = self.entries.get(filename)
+            if entry is not None and entry.sha256 is not None:
+                result[filename] = entry.sha256
+            else:
+                missing.append(filename)
+
+        if missing:
+            with ThreadPoolExecutor(workers) as pool:
+                hashed = [e for e in pool.map(self._hash_file, missing) if e]
+            self.record(hashed)
+            result.update((entry.filename, entry.sha256) for entry in hashed)
+            self.logger.info(f"Посчитаны хэши {len(hashed)} файлов аудио")
+        return result
+
+    def reconcile(self) -> None:
+        """Сверяет реестр с содержимым папки за один проход scandir."""
+        on_disk: dict[str, os.stat_result] = {}
+        with os.scandir(self.folder) as it:
+            for item in it:
+                if item.name.endswith(".mp3") and item.is_file():
+                    on_disk[item.name] = item.stat()
+
+        removed = [name for name in self.entries if name not in on_disk]
+        changed = []
+        for name, stat in on_disk.items():
+            entry = self.entries.get(name)
+            current = (stat.st_size, stat.st_mtime_ns)
+            # новый файл или подменённый вручную: сведений об озвучке нет
+            if entry is None or (entry.size, entry.mtime_ns) != current:
+                changed.append(
+                    AudioEntry(name, stat.st_size, stat.st_mtime_ns, *[None] * 4)
+                )
+
+        if removed:
+            self._conn.executemany(
+                "DELETE FROM audio WHERE filename = ?", [(name,) for name in removed]
+            )
+            self._conn.commit()
+            for name in removed:
+                del self.entries[name]
+        if changed:
+            self.record(changed)
+
+        self.logger.info(
+            f"Аудио в {self.folder}: {len(self.entries)} файлов "
+            f"(новых {len(changed)}, удалённых {len(removed)})"
+        )
+
+    def close(self) -> None:
+        self._conn.close()
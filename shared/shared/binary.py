@@ -0,0 +1,125 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Iterable
+
+_HEADER = struct.Struct("<8sI")
+_ALIGN = 8
+
+
+def file_sha256(path: Path | str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def pack_strings(strings: Iterable[str]) -> tuple[array, bytes]:
+    """Склеивает строки в один UTF-8 буфер и массив смещений (n + 1).
+
+    Смещения считаются в символах, а не байтах: буфер декодируется
+    целиком один раз, после чего строка достаётся обычным срезом.
+    """
+    offsets = array("I", [0])
+    parts = []
+    total = 0
+    for s in strings:
+        parts.append(s)
+        total += len(s)
+        offsets.append(total)
+    return offsets, "".join(parts).encode("utf-8")
+
+
+def pack_bytes(items: Iterable[bytes]) -> tuple[array, bytes]:
+    """Как ``pack_strings``, но для байтов: смещения в байтах, поэтому
+    отдельную запись можно прочитать без декодирования всего буфера."""
+    offsets = array("I", [0])
+    parts = []
+    total = 0
+    for item in items:
+        parts.append(item)
+        total += len(item)
+        offsets.append(total)
+    return offsets, b"".join(parts)
+
+
+class StringTable:
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+        self._text: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = str(self.blob, "utf-8")
+        return self._text
+
+    def __getitem__(self, i: int) -> str:
+        return self.text[self.offsets[i] : self.offsets[i + 1]]
+
+    def span(self, start: int, stop: int) -> str:
+        """Строки start..stop-1, склеенные подряд, одним срезом."""
+        return self.text[self.offsets[start] : self.offsets[stop]]
+
+
+def write_sections(
+    path: Path | str, magic: bytes, meta: dict, sections: dict[str, array | bytes]
+) -> None:
+    """Пишет файл: magic, json-заголовок и выровненные секции.
+
+    Файл сначала пишется во временный и затем атомарно подменяется.
+    """
+    layout = {}
+    offset = 0
+    for name, data in sections.items():
+        typecode = data.typecode if isinstance(data, array) else "B"
+        size = len(data) * (data.itemsize if isinstance(data, array) else 1)
+        layout[name] = [offset, size, typecode]
+        offset += size + (-size % _ALIGN)
+
+    header = json.dumps({"meta": meta, "sections": layout}).encode("utf-8")
+    header += b" " * (-(len(header) + _HEADER.size) % _ALIGN)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(magic, len(header)))
+        f.write(header)
+        for data in sections.values():
+            raw = data.tobytes() if isinstance(data, array) else data
+            f.write(raw)
+            f.write(b"\0" * (-len(raw) % _ALIGN))
+    os.replace(tmp_path, path)
+
+
+class MappedSections:
+    """Только-чтение доступ к файлу из ``write_sections`` через mmap."""
+
+    def __init__(self, path: Path | str, magic: bytes):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        file_magic, header_len = _HEADER.unpack_from(self._mmap, 0)
+        if file_magic != magic:
+            self._mmap.close()
+            raise ValueError(f"{path}: неверная сигнатура файла")
+
+        start = _HEADER.size
+        header = json.loads(self._mmap[start : start + header_len])
+        self.meta: dict = header["meta"]
+        self._layout: dict = header["sections"]
+        self._base = start + header_len
+        self._view = memoryview(self._mmap)
+
+    def section(self, name: str) -> memoryview:
+        offset, size, typecode = self._layout[name]
+        view = self._view[self._base + offset : self._base + offset + size]
+        return view if typecode == "B" else view.cast(typecode)
+
+    def strings(self, name: str) -> StringTable:
+        return StringTable(self.section(f"{name}_offsets"), self.section(name))
@@ -11,14 +11,52 @@ DB_PATH = DATA_DIR / "dictionary.db"
 CSV_PATH = DATA_DIR / "freq_list.csv"
 TTS_OUTPUT_FOLDER = PROJECT_ROOT / "output"
 ACCENTS_FILE = DATA_DIR / "accents.txt"
+HTTP_CACHE_PATH = DATA_DIR / "http_cache.db"
+AUDIO_MANIFEST_PATH = DATA_DIR / "audio_manifest.db"
+ANKI_BUILD_DIR = DATA_DIR / "anki_build"
 
 DATA_DIR.mkdir(exist_ok=True)
 TTS_OUTPUT_FOLDER.mkdir(exist_ok=True)
 
 DICT_URL = os.getenv("DICT_URL", "https://www.jardic.ru/search/search_r.php")
+JARDIC_CONCURRENCY = int(os.getenv("JARDIC_CONCURRENCY", "4"))
+JARDIC_RATE_LIMIT = float(os.getenv("JARDIC_RATE_LIMIT", "4"))
+JARDIC_MAX_IN_FLIGHT = int(os.getenv("JARDIC_MAX_IN_FLIGHT", "16"))
+JARDIC_PARSE_PROCESSES = int(
+    os.getenv("JARDIC_PARSE_PROCESSES", str(os.cpu_count() or 1))
+)
+JARDIC_HTML_BACKEND = os.getenv("JARDIC_HTML_BACKEND", "html2text")
+DB_PROFILE = os.getenv("DB_PROFILE", "wal")
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+DICT_BATCH_SIZE = int(os.getenv("DICT_BATCH_SIZE", "500"))
+DICT_REPROCESS_PROCESSES = int(
+    os.getenv("DICT_REPROCESS_PROCESSES", str(os.cpu_count() or 1))
+)
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") == "1"
+HTTP_CACHE_TTL_DAYS = float(os.getenv("HTTP_CACHE_TTL_DAYS", "90"))
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "2048"))
+HTTP_OFFLINE = os.getenv("HTTP_OFFLINE", "0") == "1"
 JARDIC_PATH = os.getenv(
     "JARDIC_PATH", r"C:\Program Files (x86)\JardicPro\JardicPro.exe"
 )
+ANKI_FULL_REBUILD = os.getenv("ANKI_FULL_REBUILD", "0") == "1"
+ANKI_BATCH_SIZE = int(os.getenv("ANKI_BATCH_SIZE", "1000"))
+ANKI_SHARDED = os.getenv("ANKI_SHARDED", "0") == "1"
+ANKI_MERGED = os.getenv("ANKI_MERGED", "1") == "1"
+ANKI_EXPORT_PROCESSES = int(
+    os.getenv("ANKI_EXPORT_PROCESSES", str(os.cpu_count() or 1))
+)
+ANKI_MEDIA_WORKERS = int(os.getenv("ANKI_MEDIA_WORKERS", "8"))
 TTS_BATCH_SIZE = int(os.getenv("TTS_BATCH_SIZE", "8"))
+TTS_MAX_BATCH_SIZE = int(os.getenv("TTS_MAX_BATCH_SIZE", str(4 * TTS_BATCH_SIZE)))
+TTS_TROUBLESOME_FILE = DATA_DIR / "tts_troublesome.txt"
 TTS_SPEAKER_ID = int(os.getenv("TTS_SPEAKER_ID", "13"))
 VOICEVOX_URL = os.getenv("VOICEVOX_URL", "http://127.0.0.1:50021")
+VOICEVOX_URLS = [
+    url.strip()
+    for url in os.getenv("VOICEVOX_URLS", VOICEVOX_URL).split(",")
+    if url.strip()
+]
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", str(2 * len(VOICEVOX_URLS))))
+TTS_ENCODE_PROCESSES = int(os.getenv("TTS_ENCODE_PROCESSES", str(os.cpu_count() or 1)))
@@ -1,29 +1,97 @@
 import logging
+import re
+import jaconv
 from shared.config import CSV_PATH
 import csv
 
-from typing import List
+from typing import Callable, Iterator, List, NamedTuple
 
 EXCLUDED_POS = frozenset(["助動詞", "記号", "動詞-接尾", "助詞"])
 
+_NON_DIGITS_RE = re.compile(r"\D")
 
-def get_words() -> List[List[str]]:
-    words = []
-    line_number = 0
+
+class WordRecord(NamedTuple):
+    """Строка частотного списка. Первые три поля совпадают с колонками csv,
+    поэтому запись можно передавать туда, где ожидался ``wordcsv``."""
+
+    word: str
+    pos: str
+    reading: str
+    frequency: int
+    index: int
+    hira: str
+
+
+def default_pos_filter(pos: str) -> bool:
+    return pos not in EXCLUDED_POS
+
+
+def is_bracketed(word: str) -> bool:
+    """Строки со скобкой 【 в слове частотный список пропускает."""
+    return "【" in word
+
+
+def parse_row(row: List[str], row_index: int) -> WordRecord:
+    """Строка csv в ``WordRecord``: частота без разделителей разрядов,
+    чтение дополнительно хираганой."""
+    return WordRecord(
+        row[0],
+        row[1],
+        row[2],
+        int(_NON_DIGITS_RE.sub("", row[3]) or 0),
+        row_index,
+        jaconv.kata2hira(row[2].strip()),
+    )
+
+
+def iter_words(
+    start: int = 0,
+    stop: int | None = None,
+    pos_filter: Callable[[str], bool] = default_pos_filter,
+) -> Iterator[WordRecord]:
+    """Лениво читает частотный список.
+
+    ``start``/``stop`` задают срез по уже отфильтрованным словам, чтение
+    файла прекращается, как только срез набран. ``index`` - номер строки
+    в csv, он не зависит от фильтра и используется как ``index_csv``.
+
+    Если рядом с csv лежит свежий freq_list.idx (см. ``shared.freq_index``),
+    записи читаются из него без разбора csv.
+    """
+    from shared.freq_index import load_freq_index
+
+    freq_index = load_freq_index(CSV_PATH)
+    if freq_index is not None:
+        yield from freq_index.iter_words(start, stop, pos_filter)
+        return
+
+    if stop is not None and stop <= start:
+        return
+
+    position = 0
+    row_index = 0
 
     with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
         csv_file = csv.reader(f)
         logging.debug(f"Открытие файла: {CSV_PATH}")
 
         try:
-            for row in csv_file:
-                line_number += 1
-                if row[1] in EXCLUDED_POS or "【" in row[0]:
+            for row_index, row in enumerate(csv_file):
+                if is_bracketed(row[0]) or not pos_filter(row[1]):
                     continue
-                words.append(row)
+
+                if position >= start:
+                    yield parse_row(row, row_index)
+
+                position += 1
+                if stop is not None and position >= stop:
+                    return
         except csv.Error as e:
-            logging.error(f"Ошибка в строке №{line_number}")
+            logging.error(f"Ошибка в строке №{row_index + 1}")
             logging.error(f"Тип ошибки: {e}")
             raise
 
-        return words
+
+def get_words() -> List[WordRecord]:
+    return list(iter_words())
@@ -1,17 +1,66 @@
+from pathlib import Path
 from typing import Iterator
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
-from shared.config import DB_PATH
+from shared.config import DB_PATH, DB_PROFILE, SQLITE_CACHE_SIZE, SQLITE_MMAP_SIZE
 
-engine = create_engine(f"sqlite:///{DB_PATH}")
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "default": {},
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": SQLITE_CACHE_SIZE,
+        "mmap_size": SQLITE_MMAP_SIZE,
+    },
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "temp_store": "MEMORY",
+        "cache_size": SQLITE_CACHE_SIZE,
+        "mmap_size": SQLITE_MMAP_SIZE,
+    },
+}
+
+
+def create_sqlite_engine(
+    path: Path | str = DB_PATH, profile: str = DB_PROFILE, read_only: bool = False
+) -> Engine:
+    pragmas = dict(SQLITE_PROFILES[profile])
+
+    if read_only:
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("synchronous", None)
+        pragmas["query_only"] = "ON"
+        url = f"sqlite:///file:{Path(path).as_posix()}?mode=ro&uri=true"
+    else:
+        url = f"sqlite:///{path}"
+
+    engine = create_engine(url)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    return engine
+
+
+engine = create_sqlite_engine()
 SessionLocal = sessionmaker(bind=engine)
 
+_readonly_sessionmaker: sessionmaker | None = None
+
 
 def init_db():
     from .models import Base
+    from .migrations import migrate
 
     Base.metadata.create_all(engine)
+    migrate(engine)
 
 
 @contextmanager
@@ -25,3 +74,16 @@ def get_session() -> Iterator[Session]:
         raise
     finally:
         session.close()
+
+
+@contextmanager
+def get_readonly_session() -> Iterator[Session]:
+    global _readonly_sessionmaker
+    if _readonly_sessionmaker is None:
+        _readonly_sessionmaker = sessionmaker(bind=create_sqlite_engine(read_only=True))
+
+    session: Session = _readonly_sessionmaker()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,86 @@
+from collections import defaultdict
+from typing import Iterable, NamedTuple
+
+from shared.regex import split_variants
+
+
+class TranslationLookup:
+    """Индекс уже сохранённых переводов в памяти.
+
+    Хранит пары (вариант написания, чтение) и варианты чтений, разбитые
+    по ``split_by_dots``, чтобы проверка слова не требовала SQL запросов.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, str, int | None]] = ()):
+        self.words: set[tuple[str, str]] = set()
+        self.readings: set[str] = set()
+        self.indexes: set[int] = set()
+
+        for word, reading, index_csv in rows:
+            self.add(word, reading, index_csv)
+
+    def add(self, word: str, reading: str, index_csv: int | None = None) -> None:
+        reading = reading.strip()
+        for variant in split_variants(word):
+            self.words.add((variant, reading))
+        self.readings.add(reading)
+        self.readings.update(split_variants(reading))
+        if index_csv is not None:
+            self.indexes.add(index_csv)
+
+    def has_word(self, word: str, reading: str) -> bool:
+        return (word, reading) in self.words
+
+    def has_reading(self, reading: str) -> bool:
+        return reading in self.readings
+
+
+class TranslationRow(NamedTuple):
+    id: int
+    word: str
+    reading: str
+    mainsense: str
+    senses: str
+    index_csv: int | None
+
+
+class TranslationIndex:
+    """Все переводы в памяти с индексами по вариантам написания и чтения.
+
+    Отвечает так же, как ``get_by_word_and_reading`` и ``get_by_reading``
+    (первые по id), но без SQL запроса на каждое слово.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[TranslationRow],
+        words: Iterable[tuple[int, str]],
+        readings: Iterable[tuple[int, str]],
+    ):
+        self.rows: dict[int, TranslationRow] = {row.id: row for row in rows}
+
+        self._by_word: dict[tuple[str, str], int] = {}
+        for translation_id, word in words:
+            row = self.rows.get(translation_id)
+            if row is None:
+                continue
+            key = (word, row.reading)
+            if translation_id < self._by_word.get(key, translation_id + 1):
+                self._by_word[key] = translation_id
+
+        self._by_reading: dict[str, list[int]] = defaultdict(list)
+        for translation_id, reading in readings:
+            if translation_id in self.rows:
+                self._by_reading[reading].append(translation_id)
+        for ids in self._by_reading.values():
+            ids.sort()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def by_word_and_reading(self, word: str, reading: str) -> TranslationRow | None:
+        translation_id = self._by_word.get((word, reading))
+        return None if translation_id is None else self.rows[translation_id]
+
+    def by_reading(self, reading: str, limit: int = 3) -> list[TranslationRow]:
+        return [self.rows[i] for i in self._by_reading.get(reading, ())[:limit]]
@@ -0,0 +1,86 @@
+import logging
+from typing import Callable
+
+from sqlalchemy import Engine, bindparam, insert, text, update
+from sqlalchemy.orm import Session
+
+from shared.csv import iter_words
+from shared.regex import split_variants
+from .models import TranslationReadingTable, TranslationTable, TranslationWordTable
+
+Logger = logging.getLogger(__name__)
+
+
+def backfill_variants(session: Session) -> None:
+    """Заполняет translation_words/translation_readings для старых баз."""
+    session.query(TranslationWordTable).delete()
+    session.query(TranslationReadingTable).delete()
+
+    words = []
+    readings = []
+    rows = session.query(
+        TranslationTable.id, TranslationTable.word, TranslationTable.reading
+    )
+    for translation_id, word, reading in rows:
+        words.extend(
+            {"translation_id": translation_id, "word": w} for w in split_variants(word)
+        )
+        readings.extend(
+            {"translation_id": translation_id, "reading": r}
+            for r in split_variants(reading)
+        )
+
+    if words:
+        session.execute(insert(TranslationWordTable), words)
+    if readings:
+        session.execute(insert(TranslationReadingTable), readings)
+    Logger.info(f"Заполнено вариантов: слов {len(words)}, чтений {len(readings)}")
+
+
+def remap_index_csv(session: Session) -> None:
+    """index_csv был позицией в отфильтрованном списке, теперь это номер строки csv."""
+    old_indexes = [
+        index
+        for (index,) in session.query(TranslationTable.index_csv)
+        .filter(TranslationTable.index_csv.is_not(None))
+        .distinct()
+    ]
+    if not old_indexes:
+        return
+
+    rows = [record.index for record in iter_words(stop=max(old_indexes) + 1)]
+    # new >= old, поэтому обновление по убыванию не задевает ещё не обработанные
+    params = [
+        {"old": old, "new": rows[old]}
+        for old in sorted(old_indexes, reverse=True)
+        if old < len(rows) and rows[old] != old
+    ]
+    if params:
+        session.connection().execute(
+            update(TranslationTable)
+            .where(TranslationTable.index_csv == bindparam("old"))
+            .values(index_csv=bindparam("new")),
+            params,
+        )
+    Logger.info(f"Перенумеровано index_csv: {len(params)}")
+
+
+MIGRATIONS: list[tuple[int, Callable[[Session], None]]] = [
+    (1, backfill_variants),
+    (2, remap_index_csv),
+]
+
+
+def migrate(engine: Engine) -> None:
+    with engine.connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+    for target, step in MIGRATIONS:
+        if version >= target:
+            continue
+        Logger.info(f"Миграция базы до версии {target}: {step.__name__}")
+        with Session(engine) as session:
+            step(session)
+            session.execute(text(f"PRAGMA user_version = {target}"))
+            session.commit()
+        version = target
@@ -19,6 +19,16 @@ class TranslationTable(Base):
     examples: Mapped[list["ExampleTable"]] = relationship(
         "ExampleTable", back_populates="translation", cascade="all, delete-orphan"
     )
+    words: Mapped[list["TranslationWordTable"]] = relationship(
+        "TranslationWordTable",
+        back_populates="translation",
+        cascade="all, delete-orphan",
+    )
+    readings: Mapped[list["TranslationReadingTable"]] = relationship(
+        "TranslationReadingTable",
+        back_populates="translation",
+        cascade="all, delete-orphan",
+    )
 
     __table_args__ = (UniqueConstraint("word", "reading", name="_word_reading_uc"),)
 
@@ -37,9 +47,70 @@ class ExampleTable(Base):
     )
 
 
+class TranslationWordTable(Base):
+    __tablename__ = "translation_words"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    word: Mapped[str] = mapped_column(String, index=True)
+
+    translation_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("translations.id"), index=True
+    )
+    translation: Mapped["TranslationTable"] = relationship(
+        "TranslationTable", back_populates="words"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("translation_id", "word", name="_translation_word_uc"),
+    )
+
+
+class TranslationReadingTable(Base):
+    __tablename__ = "translation_readings"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    reading: Mapped[str] = mapped_column(String, index=True)
+
+    translation_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("translations.id"), index=True
+    )
+    translation: Mapped["TranslationTable"] = relationship(
+        "TranslationTable", back_populates="readings"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("translation_id", "reading", name="_translation_reading_uc"),
+    )
+
+
 class NotFoundTable(Base):
     __tablename__ = "not_found"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     word: Mapped[str] = mapped_column(String)
     reading: Mapped[str] = mapped_column(String)
+
+
+class RawArticleTable(Base):
+    """Текст статьи, из которой получены переводы слова, для повторной
+    обработки без скачивания (dictmaker/reprocess.py)."""
+
+    __tablename__ = "raw_articles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source: Mapped[str] = mapped_column(String)
+    query_word: Mapped[str] = mapped_column(String)
+    query_reading: Mapped[str] = mapped_column(String)
+    index_csv: Mapped[int | None] = mapped_column(Integer, index=True)
+    position: Mapped[int] = mapped_column(Integer)
+    text: Mapped[str] = mapped_column(String)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "source",
+            "query_word",
+            "query_reading",
+            "position",
+            name="_raw_article_uc",
+        ),
+    )
@@ -1,24 +1,148 @@
+from typing import Iterable, Literal
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from shared.regex import split_variants
 from .db_session import get_session
-from .models import ExampleTable, NotFoundTable, TranslationTable
+from .lookup import TranslationIndex, TranslationRow
+from .models import (
+    ExampleTable,
+    NotFoundTable,
+    RawArticleTable,
+    TranslationReadingTable,
+    TranslationTable,
+    TranslationWordTable,
+)
+
+
+def save_to_sqlite(
+    dictionary: list,
+    session: Session | None = None,
+    on_conflict: Literal["ignore", "update"] = "ignore",
+) -> None:
+    """Пакетно сохраняет переводы, их варианты и примеры.
 
+    Дубликаты по (word, reading) не роняют весь батч: при ``ignore``
+    существующая запись остаётся как есть, при ``update`` её поля и
+    примеры заменяются новыми.
+    """
 
-def save_to_sqlite(dictionary: list, session: Session | None = None) -> None:
     def _save(sess: Session):
+        items = {}
         for item in dictionary:
-            db_translation = TranslationTable(
-                word=item.word,
-                reading=item.reading,
-                mainsense=item.mainsense,
-                senses=item.senses,
-                index_csv=item.index_csv,
+            key = (item.word, item.reading)
+            if on_conflict == "update" or key not in items:
+                items[key] = item
+        if not items:
+            return
+
+        stmt = sqlite_insert(TranslationTable)
+        if on_conflict == "update":
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["word", "reading"],
+                set_={
+                    "mainsense": stmt.excluded.mainsense,
+                    "senses": stmt.excluded.senses,
+                    "index_csv": stmt.excluded.index_csv,
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=["word", "reading"])
+
+        saved = sess.execute(
+            stmt.returning(
+                TranslationTable.id, TranslationTable.word, TranslationTable.reading
+            ),
+            [
+                {
+                    "word": item.word,
+                    "reading": item.reading,
+                    "mainsense": item.mainsense,
+                    "senses": item.senses,
+                    "index_csv": item.index_csv,
+                }
+                for item in items.values()
+            ],
+        ).all()
+        if not saved:
+            return
+
+        words, readings, examples = [], [], []
+        for translation_id, word, reading in saved:
+            item = items[(word, reading)]
+            words.extend(
+                {"translation_id": translation_id, "word": w}
+                for w in split_variants(word)
+            )
+            readings.extend(
+                {"translation_id": translation_id, "reading": r}
+                for r in split_variants(reading)
+            )
+            examples.extend(
+                {
+                    "translation_id": translation_id,
+                    "ja": ex.ja,
+                    "re": ex.re,
+                    "tr": ex.tr,
+                }
+                for ex in item.examples
             )
-            for ex in item.examples:
-                db_translation.examples.append(
-                    ExampleTable(ja=ex.ja, re=ex.re, tr=ex.tr)
+
+        if on_conflict == "update":
+            ids = [row[0] for row in saved]
+            sess.execute(
+                delete(ExampleTable).where(ExampleTable.translation_id.in_(ids))
+            )
+
+        if words:
+            sess.execute(
+                sqlite_insert(TranslationWordTable).on_conflict_do_nothing(), words
+            )
+        if readings:
+            sess.execute(
+                sqlite_insert(TranslationReadingTable).on_conflict_do_nothing(),
+                readings,
+            )
+        if examples:
+            sess.execute(insert(ExampleTable), examples)
+
+    if session:
+        _save(session)
+    else:
+        with get_session() as new_session:
+            _save(new_session)
+
+
+def save_raw_articles(
+    rows: list[dict], session: Session | None = None, chunk_size: int = 500
+) -> None:
+    """Сохраняет тексты статей. Статьи повторно скачанного слова целиком
+    заменяют прежние, поэтому лишние позиции от старой выдачи не остаются.
+    Если слово встречается в ``rows`` несколько раз, берутся статьи
+    последнего вхождения."""
+
+    def _save(sess: Session):
+        if not rows:
+            return
+        latest = {}
+        for row in rows:
+            latest[_raw_article_key(row)] = row["index_csv"]
+        keys = list(latest)
+        for start in range(0, len(keys), chunk_size):
+            sess.execute(
+                delete(RawArticleTable).where(
+                    tuple_(
+                        RawArticleTable.source,
+                        RawArticleTable.query_word,
+                        RawArticleTable.query_reading,
+                    ).in_(keys[start : start + chunk_size])
                 )
-            sess.add(db_translation)
+            )
+        sess.execute(
+            insert(RawArticleTable),
+            [row for row in rows if row["index_csv"] == latest[_raw_article_key(row)]],
+        )
 
     if session:
         _save(session)
@@ -27,6 +151,35 @@ def save_to_sqlite(dictionary: list, session: Session | None = None) -> None:
             _save(new_session)
 
 
+def _raw_article_key(row: dict) -> tuple[str, str, str]:
+    return row["source"], row["query_word"], row["query_reading"]
+
+
+def delete_translations(
+    index_csv: Iterable[int], session: Session | None = None, chunk_size: int = 500
+) -> int:
+    """Удаляет переводы с данными index_csv вместе с вариантами и примерами."""
+
+    def _delete(sess: Session) -> int:
+        indexes = list(index_csv)
+        deleted = 0
+        for start in range(0, len(indexes), chunk_size):
+            ids = select(TranslationTable.id).where(
+                TranslationTable.index_csv.in_(indexes[start : start + chunk_size])
+            )
+            for table in (ExampleTable, TranslationWordTable, TranslationReadingTable):
+                sess.execute(delete(table).where(table.translation_id.in_(ids)))
+            deleted += sess.execute(
+                delete(TranslationTable).where(TranslationTable.id.in_(ids))
+            ).rowcount
+        return deleted
+
+    if session:
+        return _delete(session)
+    with get_session() as new_session:
+        return _delete(new_session)
+
+
 def add_not_found(word: str, reading: str, session: Session | None = None) -> None:
     db_val = NotFoundTable(word=word, reading=reading)
     if session:
@@ -56,52 +209,41 @@ def get_not_found(
 def get_by_word_and_reading(
     word: str, reading: str, session: Session | None = None
 ) -> TranslationTable | None:
-    if session:
+    def _query(sess: Session) -> TranslationTable | None:
         return (
-            session.query(TranslationTable)
+            sess.query(TranslationTable)
+            .join(TranslationWordTable)
             .filter(
-                TranslationTable.word.contains(word),
+                TranslationWordTable.word == word,
                 TranslationTable.reading == reading,
             )
+            .order_by(TranslationTable.id)
             .first()
         )
+
+    if session:
+        return _query(session)
     with get_session() as new_session:
-        return (
-            new_session.query(TranslationTable)
-            .filter(
-                TranslationTable.word.contains(word),
-                TranslationTable.reading == reading,
-            )
-            .first()
-        )
+        return _query(new_session)
 
 
 def get_by_reading(
     reading: str, limit: int = 3, session: Session | None = None
 ) -> list[TranslationTable]:
-    pattern_middle = f"%・{reading}・%"
-    pattern_middle_spaced = f"%・ {reading} ・%"
-    pattern_end = f"%・{reading}"
-    pattern_end_spaced = f"%・ {reading}"
-    pattern_start_spaced = f"{reading} ・%"
-    pattern_start = f"{reading}・%"
-
-    query_filter = or_(
-        TranslationTable.reading == reading,
-        TranslationTable.reading.like(pattern_start),
-        TranslationTable.reading.like(pattern_end),
-        TranslationTable.reading.like(pattern_middle),
-        TranslationTable.reading.like(pattern_start_spaced),
-        TranslationTable.reading.like(pattern_end_spaced),
-        TranslationTable.reading.like(pattern_middle_spaced),
-    )
+    def _query(sess: Session) -> list[TranslationTable]:
+        return (
+            sess.query(TranslationTable)
+            .join(TranslationReadingTable)
+            .filter(TranslationReadingTable.reading == reading)
+            .order_by(TranslationTable.id)
+            .limit(limit)
+            .all()
+        )
 
     if session:
-        return session.query(TranslationTable).filter(query_filter).limit(limit).all()
+        return _query(session)
     with get_session() as new_session:
-        return (
-            new_session.query(TranslationTable).filter(query_filter).limit(limit).all()
-        )
+        return _query(new_session)
 
 
 def get_all_parsed_indexes(session: Session | None = None) -> set[int]:
@@ -111,3 +253,63 @@ def get_all_parsed_indexes(session: Session | None = None) -> set[int]:
     with get_session() as new_session:
         results = new_session.query(TranslationTable.index_csv).distinct().all()
         return {r[0] for r in results if r[0] is not None}
+
+
+def get_translation_keys(
+    session: Session | None = None,
+) -> list[tuple[str, str, int | None]]:
+    query = (
+        TranslationTable.word,
+        TranslationTable.reading,
+        TranslationTable.index_csv,
+    )
+    if session:
+        return [tuple(r) for r in session.query(*query).all()]
+    with get_session() as new_session:
+        return [tuple(r) for r in new_session.query(*query).all()]
+
+
+def get_all_not_found(session: Session | None = None) -> set[tuple[str, str]]:
+    query = (NotFoundTable.word, NotFoundTable.reading)
+    if session:
+        return {tuple(r) for r in session.query(*query).all()}
+    with get_session() as new_session:
+        return {tuple(r) for r in new_session.query(*query).all()}
+
+
+def load_translation_index(
+    session: Session | None = None, chunk_size: int = 5000
+) -> TranslationIndex:
+    """Читает переводы и их варианты потоково, по одному проходу на таблицу,
+    и строит ``TranslationIndex``."""
+
+    def _load(sess: Session) -> TranslationIndex:
+        def stream(*columns):
+            # генератор: запрос выполняется, когда до него дойдёт очередь
+            yield from sess.execute(
+                select(*columns).execution_options(yield_per=chunk_size)
+            )
+
+        rows = (
+            TranslationRow(*r)
+            for r in stream(
+                TranslationTable.id,
+                TranslationTable.word,
+                TranslationTable.reading,
+                TranslationTable.mainsense,
+                TranslationTable.senses,
+                TranslationTable.index_csv,
+            )
+        )
+        return TranslationIndex(
+            rows,
+            stream(TranslationWordTable.translation_id, TranslationWordTable.word),
+            stream(
+                TranslationReadingTable.translation_id, TranslationReadingTable.reading
+            ),
+        )
+
+    if session:
+        return _load(session)
+    with get_session() as new_session:
+        return _load(new_session)
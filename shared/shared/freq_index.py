@@ -0,0 +1,206 @@
+"""Предкомпилированный бинарный индекс частотного списка.
+
+Один раз переводит freq_list.csv в memory-mapped файл рядом с ним
+(freq_list.idx): частоты, номера строк csv, флаги фильтра и упакованные
+UTF-8 строки (слово, часть речи, чтение, чтение хираганой). Строки,
+прошедшие стандартный фильтр, лежат первыми и подряд, поэтому срез
+``iter_words(start, stop)`` читается одним куском. ``iter_words`` берёт
+данные отсюда, пока индекс соответствует csv.
+
+Сборка:
+    uv run --package shared python -m shared.freq_index
+"""
+
+import csv
+import logging
+import os
+from array import array
+from pathlib import Path
+from typing import Callable, Iterator
+
+from shared.binary import MappedSections, file_sha256, pack_strings, write_sections
+from shared.config import CSV_PATH
+from shared.csv import (
+    EXCLUDED_POS,
+    WordRecord,
+    default_pos_filter,
+    is_bracketed,
+    parse_row,
+)
+
+MAGIC = b"RJFREQ01"
+FORMAT_VERSION = 1
+
+_FIELD_SEP = "\x1f"
+_RECORD_SEP = "\x1e"
+_CHUNK = 4096
+
+_BRACKET = 1
+_EXCLUDED = 2
+
+Logger = logging.getLogger(__name__)
+
+
+def index_path_for(csv_path: Path | str) -> Path:
+    return Path(csv_path).with_suffix(".idx")
+
+
+def compile_freq_index(
+    csv_path: Path | str = CSV_PATH, index_path: Path | str | None = None
+) -> Path:
+    index_path = index_path or index_path_for(csv_path)
+
+    included, excluded = [], []
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        for row_index, row in enumerate(csv.reader(f)):
+            record = parse_row(row, row_index)
+            flag = (_BRACKET if is_bracketed(record.word) else 0) | (
+                0 if default_pos_filter(record.pos) else _EXCLUDED
+            )
+            entry = (
+                row_index,
+                flag,
+                record.frequency,
+                _FIELD_SEP.join(record[:3] + (record.hira,)) + _RECORD_SEP,
+            )
+            (excluded if flag else included).append(entry)
+
+    entries = included + excluded
+    by_row = array("I", bytes(4 * len(entries)))
+    for position, entry in enumerate(entries):
+        by_row[entry[0]] = position
+
+    lines_offsets, lines = pack_strings(e[3] for e in entries)
+    stat = os.stat(csv_path)
+    meta = {
+        "version": FORMAT_VERSION,
+        "rows": len(entries),
+        "included": len(included),
+        "source_sha256": file_sha256(csv_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "excluded_pos": sorted(EXCLUDED_POS),
+    }
+    write_sections(
+        index_path,
+        MAGIC,
+        meta,
+        {
+            "row": array("I", (e[0] for e in entries)),
+            "flags": array("B", (e[1] for e in entries)),
+            "frequency": array("q", (e[2] for e in entries)),
+            "by_row": by_row,
+            "lines_offsets": lines_offsets,
+            "lines": lines,
+        },
+    )
+    Logger.info(f"Индекс {index_path} собран: {len(entries)} строк")
+    return Path(index_path)
+
+
+class FreqIndex:
+    def __init__(self, path: Path | str):
+        self._file = MappedSections(path, MAGIC)
+        self.meta = self._file.meta
+        self.included: int = self.meta["included"]
+
+        self.row = self._file.section("row")
+        self.flags = self._file.section("flags")
+        self.frequency = self._file.section("frequency")
+        self.by_row = self._file.section("by_row")
+        self.lines = self._file.strings("lines")
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+    def _records(self, start: int, stop: int) -> Iterator[WordRecord]:
+        """Записи по позициям start..stop-1 в порядке хранения."""
+        for chunk in range(start, stop, _CHUNK):
+            end = min(chunk + _CHUNK, stop)
+            lines = self.lines.span(chunk, end).split(_RECORD_SEP)
+            for line, frequency, row in zip(
+                lines, self.frequency[chunk:end], self.row[chunk:end]
+            ):
+                word, pos, reading, hira = line.split(_FIELD_SEP)
+                yield WordRecord(word, pos, reading, frequency, row, hira)
+
+    def iter_words(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+        pos_filter: Callable[[str], bool] = default_pos_filter,
+    ) -> Iterator[WordRecord]:
+        if pos_filter is default_pos_filter:
+            stop = self.included if stop is None else min(stop, self.included)
+            yield from self._records(start, stop)
+            return
+
+        if stop is not None and stop <= start:
+            return
+
+        position = 0
+        for row in range(len(self)):
+            at = self.by_row[row]
+            if self.flags[at] & _BRACKET:
+                continue
+            record = next(self._records(at, at + 1))
+            if not pos_filter(record.pos):
+                continue
+            if position >= start:
+                yield record
+            position += 1
+            if stop is not None and position >= stop:
+                return
+
+
+_loaded: dict[tuple, FreqIndex] = {}
+
+
+def load_freq_index(
+    csv_path: Path | str = CSV_PATH, index_path: Path | str | None = None
+) -> FreqIndex | None:
+    """Возвращает индекс, если он есть и собран из текущего csv, иначе None."""
+    index_path = index_path or index_path_for(csv_path)
+    try:
+        csv_stat = os.stat(csv_path)
+        index_stat = os.stat(index_path)
+    except FileNotFoundError:
+        return None
+
+    key = (
+        str(index_path),
+        index_stat.st_size,
+        index_stat.st_mtime_ns,
+        csv_stat.st_size,
+        csv_stat.st_mtime_ns,
+    )
+    if key in _loaded:
+        return _loaded[key]
+
+    try:
+        freq_index = FreqIndex(index_path)
+    except (OSError, ValueError, KeyError) as e:
+        Logger.warning(f"Не удалось открыть индекс {index_path}: {e}")
+        return None
+
+    meta = freq_index.meta
+    fresh = (
+        meta.get("version") == FORMAT_VERSION
+        and meta.get("excluded_pos") == sorted(EXCLUDED_POS)
+        and meta.get("source_size") == csv_stat.st_size
+        and (
+            meta.get("source_mtime_ns") == csv_stat.st_mtime_ns
+            or meta.get("source_sha256") == file_sha256(csv_path)
+        )
+    )
+    if not fresh:
+        Logger.info(f"Индекс {index_path} устарел, читаем csv")
+        return None
+
+    _loaded[key] = freq_index
+    return freq_index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    compile_freq_index()
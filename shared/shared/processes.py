@@ -0,0 +1,10 @@
+import multiprocessing
+from multiprocessing.context import BaseContext
+
+
+def pool_context() -> BaseContext:
+    """Контекст для пулов процессов: forkserver, где он есть, иначе spawn
+    (на Windows forkserver недоступен)."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
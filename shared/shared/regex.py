@@ -16,3 +16,8 @@ def split_by_dots(text: str) -> list[str]:
 
 def get_yarxi_readings(text: str) -> list[str]:
     return re.findall(r"\[([^\]]+)\]", text)
+
+
+def split_variants(text: str) -> set[str]:
+    variants = (v.strip().strip("…").strip() for v in split_by_dots(text))
+    return {v for v in variants if v}
@@ -0,0 +1,23 @@
+"""Общие pytest-фикстуры тестов dictmaker и ankimaker.
+
+Подключаются импортом в conftest.py:
+    from shared.testing import db_session  # noqa: F401
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from shared.database.models import Base
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,167 @@
+"""Бинарный индекс ударений для tts.
+
+accents.txt (~124 тыс. строк) один раз переводится в memory-mapped файл
+рядом с ним (accents.idx): отсортированные crc32 ключей
+``(kanji, hira)``, сами ключи в UTF-8 и ударения. Поиск -
+bisect по массиву хэшей и сверка ключа, загрузка - только mmap и чтение
+заголовка, без разбора текста.
+
+Сборка:
+    uv run --package tts python tts/accent_index.py
+"""
+
+import logging
+import os
+import zlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from shared.binary import MappedSections, file_sha256, pack_bytes, write_sections
+from shared.config import ACCENTS_FILE
+
+MAGIC = b"RJACC001"
+FORMAT_VERSION = 2
+
+_KEY_SEP = b"\x1f"
+
+Logger = logging.getLogger(__name__)
+
+
+def index_path_for(accents_path: Path | str) -> Path:
+    return Path(accents_path).with_suffix(".idx")
+
+
+def _encode_key(kanji: str, hira: str) -> bytes:
+    return kanji.encode("utf-8") + _KEY_SEP + hira.encode("utf-8")
+
+
+def _hash_key(key: bytes) -> int:
+    # коллизии crc32 допустимы: при совпадении хэша сверяется сам ключ
+    return zlib.crc32(key)
+
+
+def parse_accents(path: Path | str) -> dict[tuple[str, str], int]:
+    """Ударения из accents.txt: первый из вариантов через запятую. При
+    повторе ключа действует последняя строка, строка с нечисловым первым
+    вариантом пропускается."""
+    accents = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.strip().split()
+            if len(parts) < 3:
+                continue
+
+            try:
+                accents[(parts[0], parts[1])] = int(parts[2].split(",")[0])
+            except ValueError:
+                pass
+    return accents
+
+
+def compile_accent_index(
+    accents_path: Path | str = ACCENTS_FILE, index_path: Path | str | None = None
+) -> Path:
+    index_path = index_path or index_path_for(accents_path)
+
+    entries = []
+    for (kanji, hira), accent in parse_accents(accents_path).items():
+        key = _encode_key(kanji, hira)
+        entries.append((_hash_key(key), key, accent))
+    entries.sort()
+
+    keys_offsets, keys = pack_bytes(e[1] for e in entries)
+
+    stat = os.stat(accents_path)
+    write_sections(
+        index_path,
+        MAGIC,
+        {
+            "version": FORMAT_VERSION,
+            "entries": len(entries),
+            "source_sha256": file_sha256(accents_path),
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+        },
+        {
+            "hashes": array("I", (e[0] for e in entries)),
+            "keys_offsets": keys_offsets,
+            "keys": keys,
+            "accents": array("h", (e[2] for e in entries)),
+        },
+    )
+    Logger.info(f"Индекс {index_path} собран: {len(entries)} ключей")
+    return Path(index_path)
+
+
+class AccentIndex(Mapping[tuple[str, str], int]):
+    """Ударения из accents.idx - то же, что ``read_accents_file``, но без
+    загрузки в память."""
+
+    def __init__(self, path: Path | str):
+        self._file = MappedSections(path, MAGIC)
+        self.meta = self._file.meta
+        self._hashes = self._file.section("hashes")
+        self._keys_offsets = self._file.section("keys_offsets")
+        self._keys = self._file.section("keys")
+        self._accents = self._file.section("accents")
+
+    def _find(self, kanji: str, hira: str) -> int | None:
+        key = _encode_key(kanji, hira)
+        h = _hash_key(key)
+        i = bisect_left(self._hashes, h)
+        while i < len(self._hashes) and self._hashes[i] == h:
+            if self._keys[self._keys_offsets[i] : self._keys_offsets[i + 1]] == key:
+                return i
+            i += 1
+        return None
+
+    def __getitem__(self, key: tuple[str, str]) -> int:
+        i = self._find(*key)
+        if i is None:
+            raise KeyError(key)
+        return self._accents[i]
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        for i in range(len(self)):
+            raw = bytes(self._keys[self._keys_offsets[i] : self._keys_offsets[i + 1]])
+            kanji, hira = raw.decode("utf-8").split(_KEY_SEP.decode())
+            yield kanji, hira
+
+
+def load_accent_index(
+    accents_path: Path | str = ACCENTS_FILE, index_path: Path | str | None = None
+) -> AccentIndex | None:
+    """Возвращает индекс, если он есть и собран из текущего accents.txt."""
+    index_path = index_path or index_path_for(accents_path)
+    try:
+        source_stat = os.stat(accents_path)
+        index = AccentIndex(index_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        Logger.warning(f"Не удалось открыть индекс {index_path}: {e}")
+        return None
+
+    meta = index.meta
+    fresh = (
+        meta.get("version") == FORMAT_VERSION
+        and meta.get("source_size") == source_stat.st_size
+        and (
+            meta.get("source_mtime_ns") == source_stat.st_mtime_ns
+            or meta.get("source_sha256") == file_sha256(accents_path)
+        )
+    )
+    if not fresh:
+        Logger.info(f"Индекс {index_path} устарел, читаем {accents_path}")
+        return None
+    return index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    compile_accent_index()
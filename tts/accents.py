@@ -0,0 +1,42 @@
+import os
+import re
+from collections.abc import Mapping
+from logging import getLogger
+from pathlib import Path
+
+from accent_index import load_accent_index, parse_accents
+
+Logger = getLogger(__name__)
+
+
+def load_accents(filepath: Path) -> Mapping[tuple[str, str], int]:
+    """Ударения по ``(kanji, hira)``. Если рядом лежит свежий accents.idx
+    (см. ``accent_index``), файл не читается."""
+    accents = {}
+    if not os.path.exists(filepath):
+        Logger.warning(
+            f"Файл {filepath} не найден. Ударения будут расставлены по умолчанию."
+        )
+        return accents
+
+    index = load_accent_index(filepath)
+    if index is not None:
+        return index
+    return read_accents_file(filepath)
+
+
+def read_accents_file(filepath: Path) -> dict[tuple[str, str], int]:
+    return parse_accents(filepath)
+
+
+def build_aquestalk_kana(katakana: str, accent: int) -> str:
+    moras = re.findall(r"[ァ-ヴー][ァ-ォャ-ョヮ]*", katakana)
+
+    if not moras:
+        return katakana
+
+    if accent == 0 or accent >= len(moras):
+        return katakana + "'"
+
+    moras.insert(accent, "'")
+    return "".join(moras)
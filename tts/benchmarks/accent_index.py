@@ -0,0 +1,77 @@
+"""Сравнение загрузки ударений: словарь из accents.txt и accents.idx.
+
+Каждый способ меряется в отдельном процессе, чтобы RSS не смешивался.
+
+Запуск:
+    uv run --package tts python tts/benchmarks/accent_index.py [lookups]
+"""
+
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TTS_DIR))
+
+from shared.config import ACCENTS_FILE  # noqa: E402
+
+from accent_index import AccentIndex, compile_accent_index, parse_accents  # noqa: E402
+from accents import read_accents_file  # noqa: E402
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def child(method: str, index_path: str, lookups: int) -> None:
+    keys = list(parse_accents(ACCENTS_FILE))
+    queries = random.Random(42).choices(keys, k=lookups)
+
+    before = rss_kb()
+    start = time.perf_counter()
+    if method == "dict":
+        accents = read_accents_file(ACCENTS_FILE)
+    else:
+        accents = AccentIndex(index_path)
+    loaded = time.perf_counter() - start
+    rss = rss_kb() - before
+
+    start = time.perf_counter()
+    for key in queries:
+        accents.get(key, 0)
+    looked_up = time.perf_counter() - start
+
+    print(
+        f"{method:>6}: загрузка {loaded * 1000:8.2f} мс, RSS +{rss / 1024:6.1f} МБ, "
+        f"{lookups} поисков за {looked_up * 1000:.1f} мс"
+    )
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        return
+
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 25_000
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = str(Path(tmp) / "accents.idx")
+        start = time.perf_counter()
+        compile_accent_index(ACCENTS_FILE, index_path)
+        print(f"Сборка индекса: {time.perf_counter() - start:.2f} с")
+
+        for method in ("dict", "index"):
+            subprocess.run(
+                [sys.executable, __file__, "--child", method, index_path, str(lookups)],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
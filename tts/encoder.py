@@ -0,0 +1,93 @@
+"""Кодирование кусков PCM в mp3 одним процессом ffmpeg на батч.
+
+``AudioSegment.export`` запускает ffmpeg на каждое слово. Здесь весь
+батч подаётся в stdin одним потоком сырого PCM, а ffmpeg сам режет его
+фильтрами ``atrim`` (с точностью до сэмпла) и пишет все mp3 за один
+запуск. Файлы пишутся во временные имена и переименовываются после
+успешного завершения, так что в папке не бывает недописанных mp3.
+"""
+
+import os
+import subprocess
+import time
+from collections.abc import Buffer
+
+from pydub import AudioSegment
+
+from segmentation import PcmFormat
+
+BITRATE = "64k"
+
+_RAW_FORMATS = {1: "u8", 2: "s16le", 4: "s32le"}
+
+
+class EncodeError(RuntimeError):
+    """ffmpeg завершился с ошибкой или не записал все файлы."""
+
+
+def _filter_graph(bounds: list[tuple[int, int]]) -> str:
+    splits = "".join(f"[s{i}]" for i in range(len(bounds)))
+    graph = [f"[0:a]asplit={len(bounds)}{splits}"]
+    for i, (start, end) in enumerate(bounds):
+        graph.append(
+            f"[s{i}]atrim=start_sample={start}:end_sample={end},"
+            f"asetpts=PTS-STARTPTS[o{i}]"
+        )
+    return ";".join(graph)
+
+
+def encode_mp3(
+    chunks: list[Buffer], fmt: PcmFormat, paths: list[str], bitrate: str = BITRATE
+) -> float:
+    """Кодирует каждый кусок PCM в свой mp3. Возвращает время работы ffmpeg."""
+    if fmt.sample_width not in _RAW_FORMATS:
+        raise EncodeError(f"неподдерживаемая разрядность: {fmt.sample_width} байт")
+
+    bounds = []
+    sample = 0
+    for chunk in chunks:
+        samples = len(memoryview(chunk).cast("B")) // fmt.frame_size
+        bounds.append((sample, sample + samples))
+        sample += samples
+
+    tmp_paths = [f"{path}.{os.getpid()}.tmp" for path in paths]
+    command = [
+        AudioSegment.converter,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-f",
+        _RAW_FORMATS[fmt.sample_width],
+        "-ar",
+        str(fmt.sample_rate),
+        "-ac",
+        str(fmt.channels),
+        "-i",
+        "pipe:0",
+        "-filter_complex",
+        _filter_graph(bounds),
+    ]
+    for i, tmp_path in enumerate(tmp_paths):
+        command += ["-map", f"[o{i}]", "-b:a", bitrate, "-f", "mp3", "-y", tmp_path]
+
+    start = time.perf_counter()
+    try:
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+        except BrokenPipeError:
+            pass
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            raise EncodeError(stderr.decode("utf-8", "replace").strip())
+
+        for tmp_path, path in zip(tmp_paths, paths):
+            os.replace(tmp_path, path)
+    finally:
+        for tmp_path in tmp_paths:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return time.perf_counter() - start
@@ -0,0 +1,385 @@
+import hashlib
+import io
+import itertools
+import os
+import threading
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from logging import getLogger
+from pathlib import Path
+
+import jaconv
+import requests
+from pydub import AudioSegment
+from pydub.silence import split_on_silence
+
+from shared.audio_manifest import AudioEntry, AudioManifest
+from shared.processes import pool_context
+
+from accents import build_aquestalk_kana
+from encoder import encode_mp3
+from segmentation import PcmFormat, parse_wav, segment_wav
+from voicevox import RequestStats, VoicevoxClient
+
+Logger = getLogger(__name__)
+
+Word = tuple[str, str, str]
+
+BATCH_SETTINGS = {"speedScale": 0.8, "pauseLength": 0.8}
+SINGLE_SETTINGS = {
+    "speedScale": 0.8,
+    "prePhonemeLength": 0.15,
+    "postPhonemeLength": 0.15,
+}
+
+
+def _split(audio: AudioSegment) -> list[AudioSegment]:
+    return split_on_silence(
+        audio,
+        min_silence_len=250,
+        silence_thresh=audio.dBFS - 30,
+        keep_silence=150,
+    )
+
+
+def _mp3_path(filename: str, output_folder: str) -> str:
+    return os.path.join(output_folder, filename.rsplit(".", 1)[0] + ".mp3")
+
+
+def _audio_entry(path: str, duration: float) -> AudioEntry:
+    with open(path, "rb") as f:
+        sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+        stat = os.fstat(f.fileno())
+    return AudioEntry(
+        os.path.basename(path),
+        stat.st_size,
+        stat.st_mtime_ns,
+        duration,
+        sha256,
+        None,
+        None,
+    )
+
+
+def _encode(
+    chunks: list, fmt: PcmFormat, filenames: list[str], output_folder: str
+) -> tuple[list[AudioEntry], float]:
+    paths = [_mp3_path(filename, output_folder) for filename in filenames]
+    seconds = encode_mp3(chunks, fmt, paths)
+    entries = [
+        _audio_entry(path, len(chunk) / fmt.frame_size / fmt.sample_rate)
+        for chunk, path in zip(chunks, paths)
+    ]
+    return entries, seconds
+
+
+def split_batch_audio(
+    wav: bytes, query: dict, filenames: list[str], output_folder: str
+) -> tuple[list[AudioEntry], float] | None:
+    """Режет аудио батча на слова и сохраняет mp3. Границы берутся из
+    таймингов мор (``segmentation``), при неудачной проверке - по тишине.
+    None - если куски не совпали со словами (тогда ничего не пишется),
+    иначе записи о файлах и время кодирования."""
+    fmt, _ = parse_wav(wav)
+    chunks = segment_wav(wav, query, len(filenames))
+    if chunks is None:
+        Logger.debug("Тайминги мор не сошлись со звуком, режем по тишине")
+        audio = AudioSegment.from_file(io.BytesIO(wav), format="wav")
+        chunks = [chunk.raw_data for chunk in _split(audio)]
+
+    if len(chunks) != len(filenames):
+        return None
+
+    return _encode(chunks, fmt, filenames, output_folder)
+
+
+def export_audio(
+    wav: bytes, filename: str, output_folder: str, count_pieces: bool = True
+) -> tuple[AudioEntry, int, float]:
+    """Сохраняет одно слово целиком. Кроме записи о файле и времени
+    кодирования возвращает, на сколько кусков слово распалось бы по
+    тишине: больше одного - слово нельзя класть в батч. Без
+    ``count_pieces`` (слово и так озвучивается отдельно) аудио по тишине
+    не режется и кусок считается один."""
+    fmt, pcm = parse_wav(wav)
+    (entry,), seconds = _encode([pcm], fmt, [filename], output_folder)
+    if not count_pieces:
+        return entry, 1, seconds
+    audio = AudioSegment.from_file(io.BytesIO(wav), format="wav")
+    return entry, len(_split(audio)), seconds
+
+
+class BatchSizer:
+    """Подбирает размер батча по доле недавних несовпадений нарезки.
+
+    После ``window`` батчей без лишних несовпадений размер растёт на один,
+    а если несовпадений в окне больше ``shrink_above`` - уменьшается вдвое.
+    Доля считается не меньше чем по половине окна, иначе одно несовпадение
+    сразу после смены размера давало бы долю 1.0.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        maximum: int,
+        minimum: int = 2,
+        window: int = 8,
+        grow_below: float = 0.125,
+        shrink_above: float = 0.25,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self.window = window
+        self.grow_below = grow_below
+        self.shrink_above = shrink_above
+        self.recent: deque[bool] = deque(maxlen=window)
+
+    @property
+    def mismatch_rate(self) -> float:
+        if not self.recent:
+            return 0.0
+        return self.recent.count(False) / len(self.recent)
+
+    def record(self, size: int, matched: bool) -> None:
+        if size != self.size:
+            # батч собран до последней смены размера
+            return
+        self.recent.append(matched)
+        rate = self.mismatch_rate
+        if (
+            not matched
+            and len(self.recent) >= self.window // 2
+            and rate > self.shrink_above
+        ):
+            self._resize(max(self.minimum, self.size // 2))
+        elif len(self.recent) == self.window and rate < self.grow_below:
+            self._resize(min(self.maximum, self.size + 1))
+
+    def _resize(self, size: int) -> None:
+        if size != self.size:
+            Logger.info(f"Размер батча: {self.size} -> {size}")
+            self.size = size
+        self.recent.clear()
+
+
+class SynthesisPipeline:
+    """Конвейер озвучки: синтез на нескольких движках Voicevox в пуле
+    потоков, нарезка и кодирование mp3 - в пуле процессов.
+
+    Одновременно в работе не больше ``workers`` запросов к движкам и
+    ``processes`` задач пост-обработки, поэтому сеть и CPU перекрываются.
+
+    Батч, который не разрезался на нужное число кусков, делится пополам,
+    пока не дойдёт до отдельных слов. Слова, которые распадаются по тишине
+    и сами по себе, запоминаются в ``troublesome_path`` и дальше
+    озвучиваются отдельно, а размер батча подстраивается ``BatchSizer``.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        speaker: int,
+        accents: Mapping[tuple[str, str], int],
+        output_folder: Path | str,
+        batch_size: int,
+        workers: int,
+        processes: int,
+        max_batch_size: int | None = None,
+        troublesome_path: Path | str | None = None,
+        manifest: AudioManifest | None = None,
+    ):
+        self.urls = urls
+        self.speaker = speaker
+        self.accents = accents
+        self.output_folder = str(output_folder)
+        self.batch_size = batch_size
+        self.sizer = BatchSizer(batch_size, max_batch_size or 4 * batch_size)
+        self.troublesome_path = troublesome_path
+        self.troublesome = self._load_troublesome()
+        self.manifest = manifest
+        self.workers = max(1, workers)
+        self.processes = max(1, processes)
+
+        self._local = threading.local()
+        self._next_url = itertools.count()
+        self._url_lock = threading.Lock()
+        self.stats = RequestStats()
+        self.encoded = 0
+        self.encode_seconds = 0.0
+
+    @property
+    def client(self) -> VoicevoxClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            with self._url_lock:
+                url = self.urls[next(self._next_url) % len(self.urls)]
+            client = VoicevoxClient(url, self.speaker, self.stats)
+            self._local.client = client
+        return client
+
+    def accent(self, kanji: str, katakana: str) -> int:
+        return self.accents.get((kanji, jaconv.kata2hira(katakana)), 0)
+
+    def aquestalk(self, kanji: str, katakana: str) -> str:
+        return build_aquestalk_kana(katakana, self.accent(kanji, katakana))
+
+    def _record(
+        self, batch: list[Word], entries: list[AudioEntry], seconds: float
+    ) -> None:
+        self.encoded += len(entries)
+        self.encode_seconds += seconds
+        if self.manifest is None:
+            return
+        self.manifest.record(
+            entry._replace(speaker=self.speaker, accent=self.accent(kanji, katakana))
+            for (kanji, katakana, _), entry in zip(batch, entries)
+        )
+
+    def synthesize(self, kana: str, settings: dict) -> tuple[bytes, dict]:
+        client = self.client
+        try:
+            query = client.query_template()
+            query["accent_phrases"] = client.accent_phrases(kana)
+            query.update(settings)
+            return client.synthesis(query), query
+        except requests.RequestException:
+            client.invalidate()
+            raise
+
+    def synthesize_batch(self, batch: list[Word]) -> tuple[bytes, dict]:
+        text = "、".join(self.aquestalk(kanji, kata) for kanji, kata, _ in batch)
+        return self.synthesize(text, BATCH_SETTINGS)
+
+    def synthesize_single(self, word: Word) -> bytes:
+        kanji, katakana, _ = word
+        wav, _ = self.synthesize(self.aquestalk(kanji, katakana), SINGLE_SETTINGS)
+        return wav
+
+    def _load_troublesome(self) -> set[str]:
+        if self.troublesome_path is None or not os.path.exists(self.troublesome_path):
+            return set()
+        with open(self.troublesome_path, "r", encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def _mark_troublesome(self, filename: str) -> None:
+        if filename in self.troublesome:
+            return
+        self.troublesome.add(filename)
+        Logger.info(f"Слово {filename} будет озвучиваться отдельно")
+        if self.troublesome_path is not None:
+            with open(self.troublesome_path, "a", encoding="utf-8") as f:
+                f.write(filename + "\n")
+
+    def run(self, words: list[Word]) -> None:
+        regular = deque(w for w in words if w[2] not in self.troublesome)
+        singles = deque(w for w in words if w[2] in self.troublesome)
+        pending: dict[Future, tuple[str, int, list[Word], bool]] = {}
+        numbers = itertools.count(1)
+
+        with (
+            ThreadPoolExecutor(self.workers) as net,
+            ProcessPoolExecutor(self.processes, mp_context=pool_context()) as cpu,
+        ):
+            while regular or singles or pending:
+                while (regular or singles) and len(
+                    pending
+                ) < self.workers + self.processes:
+                    if singles:
+                        word = singles.popleft()
+                        future = net.submit(self.synthesize_single, word)
+                        pending[future] = ("single", next(numbers), [word], False)
+                        continue
+                    size = min(self.sizer.size, len(regular))
+                    batch = [regular.popleft() for _ in range(size)]
+                    self._submit_batch(next(numbers), batch, True, net, pending)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, number, batch, top = pending.pop(future)
+                    try:
+                        self._handle(
+                            kind, number, batch, top, future, net, cpu, pending
+                        )
+                    except Exception as e:
+                        if kind in ("batch", "split"):
+                            Logger.error(
+                                f"Ошибка при обработке батча (начиная с {batch[0][0]}): {e}"
+                            )
+                        else:
+                            Logger.error(f"Ошибка Fallback для {batch[0][2]}: {e}")
+
+        self.log_stats(len(words))
+
+    def _submit_batch(self, number, batch, top, net, pending) -> None:
+        if len(batch) == 1:
+            future = net.submit(self.synthesize_single, batch[0])
+            pending[future] = ("single", number, batch, top)
+        else:
+            future = net.submit(self.synthesize_batch, batch)
+            pending[future] = ("batch", number, batch, top)
+
+    def log_stats(self, words: int) -> None:
+        # Раньше каждый синтез стоил трёх запросов: audio_query, accent_phrases, synthesis
+        legacy = 3 * self.stats.counts["/synthesis"]
+        Logger.info(
+            f"Запросов к Voicevox: {self.stats.summary(words)}; "
+            f"без кэша заготовки было бы {legacy}"
+            + (f" ({legacy / words:.2f} на слово)" if words else "")
+        )
+        if self.encode_seconds:
+            Logger.info(
+                f"Кодирование mp3: {self.encoded} файлов за {self.encode_seconds:.1f} с "
+                f"работы ffmpeg ({self.encoded / self.encode_seconds:.1f} файлов/с)"
+            )
+
+    def _handle(self, kind, number, batch, top, future, net, cpu, pending) -> None:
+        result = future.result()
+
+        if kind == "batch":
+            wav, query = result
+            filenames = [filename for _, _, filename in batch]
+            task = cpu.submit(
+                split_batch_audio, wav, query, filenames, self.output_folder
+            )
+            pending[task] = ("split", number, batch, top)
+
+        elif kind == "split":
+            if top:
+                self.sizer.record(len(batch), result is not None)
+            if result is not None:
+                entries, seconds = result
+                self._record(batch, entries, seconds)
+                Logger.info(f"Батч {number} успешно обработан ({len(batch)} слов).")
+                return
+            Logger.warning(
+                f"Несовпадение в батче {number}. Слов: {len(batch)}. Делим пополам"
+            )
+            middle = len(batch) // 2
+            self._submit_batch(number, batch[:middle], False, net, pending)
+            self._submit_batch(number, batch[middle:], False, net, pending)
+
+        elif kind == "single":
+            filename = batch[0][2]
+            task = cpu.submit(
+                export_audio,
+                result,
+                filename,
+                self.output_folder,
+                filename not in self.troublesome,
+            )
+            pending[task] = ("export", number, batch, top)
+
+        elif kind == "export":
+            entry, chunks, seconds = result
+            self._record(batch, [entry], seconds)
+            if chunks > 1:
+                self._mark_troublesome(batch[0][2])
+            Logger.info(f"Fallback: успешно обработано {batch[0][2]}")
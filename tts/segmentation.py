@@ -0,0 +1,156 @@
+"""Нарезка аудио батча по таймингам мор из запроса Voicevox.
+
+Движок строит длительность звука детерминированно: тишина
+``prePhonemeLength``, затем моры фраз (согласная + гласная), паузы
+``pause_mora`` между фразами (``pauseLength``, если задан, и
+``pauseLengthScale``), в конце ``postPhonemeLength``; всё делится на
+``speedScale``. Значит, границы слов в батче "、"-разделённых слов
+известны заранее, и PCM можно резать срезами memoryview без анализа
+волны. Если посчитанные границы не сходятся с реальным звуком, вызывающий
+код откатывается на ``split_on_silence``.
+"""
+
+import struct
+from typing import NamedTuple
+
+# Сколько тишины оставлять вокруг слова, как keep_silence у split_on_silence
+KEEP_SILENCE = 0.15
+# Допустимое расхождение посчитанной и реальной длины звука
+DURATION_TOLERANCE = 0.1
+# Окно проверки тишины в точке разреза и порог относительно пика (-30 dB)
+CUT_WINDOW = 0.02
+SILENCE_RATIO = 10 ** (-30 / 20)
+
+
+class PcmFormat(NamedTuple):
+    channels: int
+    sample_rate: int
+    sample_width: int
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+
+def parse_wav(wav: bytes) -> tuple[PcmFormat, memoryview]:
+    """Формат и PCM-данные WAV без копирования буфера."""
+    view = memoryview(wav)
+    if bytes(view[0:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        raise ValueError("не WAV")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        try:
+            chunk = _read_chunk(view, offset)
+        except struct.error as e:
+            raise ValueError("повреждённый WAV") from e
+
+        chunk_id, size, body, chunk_fmt = chunk
+        if chunk_fmt is not None:
+            fmt = chunk_fmt
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("в WAV нет блока fmt")
+            return fmt, view[body : min(body + size, len(view))]
+        offset = body + size + (size & 1)
+
+    raise ValueError("в WAV нет блока data")
+
+
+def _read_chunk(
+    view: memoryview, offset: int
+) -> tuple[bytes, int, int, PcmFormat | None]:
+    chunk_id = bytes(view[offset : offset + 4])
+    (size,) = struct.unpack_from("<I", view, offset + 4)
+    body = offset + 8
+    if chunk_id != b"fmt ":
+        return chunk_id, size, body, None
+    _, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", view, body)
+    return chunk_id, size, body, PcmFormat(channels, sample_rate, bits // 8)
+
+
+def _mora_length(mora: dict | None) -> float:
+    if not mora:
+        return 0.0
+    return (mora.get("consonant_length") or 0.0) + (mora.get("vowel_length") or 0.0)
+
+
+def word_spans(query: dict) -> tuple[list[tuple[float, float]], float]:
+    """Интервалы звучания слов (сек.) и общая длина звука.
+
+    Слово - это фразы до паузы включительно: ровно то, что даёт
+    склейка слов через "、".
+    """
+    speed = query.get("speedScale") or 1.0
+    pause_length = query.get("pauseLength")
+    pause_scale = query.get("pauseLengthScale") or 1.0
+
+    time = (query.get("prePhonemeLength") or 0.0) / speed
+    spans = []
+    start = None
+    for phrase in query["accent_phrases"]:
+        if start is None:
+            start = time
+        time += sum(_mora_length(m) for m in phrase["moras"]) / speed
+
+        pause = phrase.get("pause_mora")
+        if pause:
+            spans.append((start, time))
+            start = None
+            length = pause_length if pause_length is not None else _mora_length(pause)
+            time += length * pause_scale / speed
+
+    if start is not None:
+        spans.append((start, time))
+    time += (query.get("postPhonemeLength") or 0.0) / speed
+    return spans, time
+
+
+def _window_peak(pcm: memoryview, fmt: PcmFormat, at: float) -> int:
+    """Пиковая амплитуда в окне CUT_WINDOW вокруг момента ``at``."""
+    frames = len(pcm) // fmt.frame_size
+    half = int(CUT_WINDOW * fmt.sample_rate / 2)
+    center = int(at * fmt.sample_rate)
+    start = max(0, center - half) * fmt.frame_size
+    stop = min(frames, center + half) * fmt.frame_size
+    return max(map(abs, pcm[start:stop].cast("h")), default=0)
+
+
+def segment_wav(wav: bytes, query: dict, count: int) -> list[memoryview] | None:
+    """Режет 16-битный WAV батча на ``count`` кусков PCM по таймингам
+    из ``query``. None - если границы не прошли проверку."""
+    try:
+        fmt, pcm = parse_wav(wav)
+    except ValueError:
+        return None
+    if fmt.sample_width != 2 or len(pcm) < fmt.frame_size:
+        return None
+
+    spans, total = word_spans(query)
+    frames = len(pcm) // fmt.frame_size
+    actual = frames / fmt.sample_rate
+    if len(spans) != count or abs(total - actual) > DURATION_TOLERANCE:
+        return None
+
+    # Звук сверяется только в нескольких окнах: середины слов должны
+    # звучать, точки разреза - молчать.
+    scale = actual / total
+    spans = [(start * scale, end * scale) for start, end in spans]
+    peak = max(_window_peak(pcm, fmt, (start + end) / 2) for start, end in spans)
+    cuts = [(a_end + b_start) / 2 for (_, a_end), (b_start, _) in zip(spans, spans[1:])]
+    if not peak or any(
+        _window_peak(pcm, fmt, cut) > peak * SILENCE_RATIO for cut in cuts
+    ):
+        return None
+
+    def offset(seconds: float) -> int:
+        return min(frames, int(seconds * fmt.sample_rate)) * fmt.frame_size
+
+    bounds = [0.0, *cuts, actual]
+    chunks = []
+    for (start, end), left, right in zip(spans, bounds, bounds[1:]):
+        first = offset(max(left, start - KEEP_SILENCE))
+        last = offset(min(right, end + KEEP_SILENCE))
+        chunks.append(pcm[first:last])
+    return chunks
@@ -0,0 +1,141 @@
+import io
+import json
+import math
+import struct
+import threading
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SAMPLE_RATE = 24000
+MORA_LENGTH = 0.1
+
+
+def make_wav(segments: list[tuple[float, bool]]) -> bytes:
+    """WAV из отрезков (длительность, звучит ли тон)."""
+    frames = bytearray()
+    for seconds, voiced in segments:
+        for i in range(int(seconds * SAMPLE_RATE)):
+            value = (
+                int(12000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE))
+                if voiced
+                else 0
+            )
+            frames += struct.pack("<h", value)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+class FakeVoicevox:
+    """Локальная замена движка Voicevox: фразы разделяются по "、",
+    каждая мора звучит MORA_LENGTH секунд, паузы берутся из запроса.
+    Фразы из ``broken`` озвучиваются с длинной паузой посередине."""
+
+    def __init__(self, version: str = "0.0.0-fake", broken: set[str] = frozenset()):
+        self.version = version
+        self.broken = broken
+        self.requests: list[str] = []
+        self._lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                with fake._lock:
+                    fake.requests.append(path)
+                if path == "/version":
+                    self._json(fake.version)
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with fake._lock:
+                    fake.requests.append(url.path)
+
+                if url.path == "/accent_phrases":
+                    self._json(fake.accent_phrases(query["text"][0]))
+                elif url.path == "/audio_query":
+                    self._json(fake.audio_query())
+                elif url.path == "/synthesis":
+                    self._send(fake.synthesis(json.loads(body)), "audio/wav")
+                else:
+                    self.send_error(404)
+
+            def _json(self, data):
+                self._send(json.dumps(data).encode("utf-8"), "application/json")
+
+            def _send(self, data: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def accent_phrases(self, kana: str) -> list[dict]:
+        phrases = []
+        for part in kana.split("、"):
+            moras = [
+                {"text": ch, "consonant_length": None, "vowel_length": MORA_LENGTH}
+                for ch in part.replace("'", "")
+            ]
+            pause = {"text": "、", "consonant_length": None, "vowel_length": 0.3}
+            phrases.append({"moras": moras, "accent": 1, "pause_mora": pause})
+        phrases[-1]["pause_mora"] = None
+        return phrases
+
+    def audio_query(self) -> dict:
+        return {
+            "accent_phrases": [],
+            "speedScale": 1.0,
+            "pitchScale": 0.0,
+            "intonationScale": 1.0,
+            "volumeScale": 1.0,
+            "prePhonemeLength": 0.1,
+            "postPhonemeLength": 0.1,
+            "pauseLength": None,
+            "outputSamplingRate": SAMPLE_RATE,
+            "outputStereo": False,
+            "kana": "",
+        }
+
+    def synthesis(self, query: dict) -> bytes:
+        speed = query.get("speedScale") or 1.0
+        pause_length = query.get("pauseLength")
+        segments = [(query["prePhonemeLength"] / speed, False)]
+        for phrase in query["accent_phrases"]:
+            length = sum(m["vowel_length"] for m in phrase["moras"]) / speed
+            if "".join(m["text"] for m in phrase["moras"]) in self.broken:
+                segments += [(length / 2, True), (0.6, False), (length / 2, True)]
+            else:
+                segments.append((length, True))
+            if phrase["pause_mora"]:
+                pause = pause_length or phrase["pause_mora"]["vowel_length"]
+                segments.append((pause / speed, False))
+        segments.append((query["postPhonemeLength"] / speed, False))
+        return make_wav(segments)
+
+    def __enter__(self) -> "FakeVoicevox":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
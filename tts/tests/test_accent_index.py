@@ -0,0 +1,45 @@
+import os
+
+from accent_index import AccentIndex, compile_accent_index, load_accent_index
+from accents import load_accents, read_accents_file
+
+ACCENTS = """１\tいち\t2
+１\tひと\t0,2
+橋\tはし\t2
+箸\tはし\t1
+雨\tあめ\t1
+雨\tあめ\t0,1
+壊れた\tこわれた\t?
+短い
+"""
+
+
+def write_accents(tmp_path):
+    path = tmp_path / "accents.txt"
+    path.write_text(ACCENTS, encoding="utf-8")
+    return path
+
+
+def test_index_matches_text_file(tmp_path):
+    path = write_accents(tmp_path)
+    index = AccentIndex(compile_accent_index(path))
+
+    assert dict(index) == read_accents_file(path)
+    assert index[("１", "ひと")] == 0
+    assert index[("雨", "あめ")] == 0
+    assert index[("箸", "はし")] == 1
+    assert index.get(("壊れた", "こわれた"), 0) == 0
+    assert ("нет", "такого") not in index
+
+
+def test_load_accents_prefers_fresh_index(tmp_path):
+    path = write_accents(tmp_path)
+    assert isinstance(load_accents(path), dict)
+
+    compile_accent_index(path)
+    assert isinstance(load_accents(path), AccentIndex)
+
+    path.write_text(ACCENTS + "傘\tかさ\t1\n", encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert load_accent_index(path) is None
+    assert load_accents(path)[("傘", "かさ")] == 1
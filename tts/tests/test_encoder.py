@@ -0,0 +1,49 @@
+import os
+import subprocess
+
+import pytest
+from pydub import AudioSegment
+
+from encoder import EncodeError, encode_mp3
+from segmentation import parse_wav
+from tests.fake_voicevox import make_wav
+from tests.test_pipeline import requires_ffmpeg
+
+
+@requires_ffmpeg
+def test_encode_mp3_writes_one_file_per_chunk(tmp_path):
+    fmt, pcm = parse_wav(make_wav([(0.5, True), (0.3, False), (1.0, True)]))
+    half = len(pcm) // 2 - len(pcm) // 2 % fmt.frame_size
+    paths = [str(tmp_path / "a.mp3"), str(tmp_path / "b.mp3")]
+
+    seconds = encode_mp3([pcm[:half], pcm[half:]], fmt, paths)
+
+    assert seconds > 0
+    assert sorted(os.listdir(tmp_path)) == ["a.mp3", "b.mp3"]
+    total = len(pcm) / fmt.frame_size / fmt.sample_rate
+    for path in paths:
+        decoded = subprocess.run(
+            [AudioSegment.converter, "-i", path, "-f", "wav", "pipe:1"],
+            capture_output=True,
+            check=True,
+        ).stdout
+        out_fmt, out_pcm = parse_wav(decoded)
+        duration = len(out_pcm) / out_fmt.frame_size / out_fmt.sample_rate
+        # mp3 добавляет задержку кодера, поэтому сравнение грубое
+        assert abs(duration - total / 2) < 0.1
+
+
+@requires_ffmpeg
+def test_encode_mp3_leaves_no_files_on_error(tmp_path):
+    fmt, pcm = parse_wav(make_wav([(0.2, True)]))
+    paths = [str(tmp_path / "a.mp3")]
+
+    with pytest.raises(EncodeError):
+        encode_mp3([pcm], fmt._replace(sample_rate=0), paths)
+    assert os.listdir(tmp_path) == []
+
+
+def test_encode_mp3_rejects_unknown_sample_width(tmp_path):
+    fmt, pcm = parse_wav(make_wav([(0.2, True)]))
+    with pytest.raises(EncodeError):
+        encode_mp3([pcm], fmt._replace(sample_width=3), [str(tmp_path / "a.mp3")])
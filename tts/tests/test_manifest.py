@@ -0,0 +1,110 @@
+import hashlib
+import os
+
+from shared.audio_manifest import AudioEntry, AudioManifest
+
+from pipeline import SynthesisPipeline
+from tests.fake_voicevox import FakeVoicevox
+from tests.test_pipeline import WORDS, requires_ffmpeg
+
+
+def test_reconcile_adopts_new_files_and_forgets_removed(tmp_path):
+    folder = tmp_path / "output"
+    folder.mkdir()
+    (folder / "a.mp3").write_bytes(b"a")
+    (folder / "notes.txt").write_text("не аудио")
+
+    manifest = AudioManifest(tmp_path / "manifest.db", folder)
+    manifest.record([AudioEntry("gone.mp3", 1, 1, 0.5, "x", 13, 0)])
+    manifest.reconcile()
+
+    assert set(manifest.entries) == {"a.mp3"}
+    assert manifest.get("a.mp3").speaker is None
+    manifest.close()
+
+    reopened = AudioManifest(tmp_path / "manifest.db", folder)
+    assert set(reopened.entries) == {"a.mp3"}
+    reopened.close()
+
+
+def test_reconcile_drops_voice_info_of_replaced_file(tmp_path):
+    (tmp_path / "a.mp3").write_bytes(b"a")
+    stat = os.stat(tmp_path / "a.mp3")
+
+    manifest = AudioManifest(tmp_path / "manifest.db", tmp_path)
+    manifest.record(
+        [AudioEntry("a.mp3", stat.st_size, stat.st_mtime_ns, 1, "x", 13, 2)]
+    )
+    manifest.reconcile()
+    assert manifest.get("a.mp3").speaker == 13
+
+    (tmp_path / "a.mp3").write_bytes(b"abc")
+    manifest.reconcile()
+    assert manifest.get("a.mp3").speaker is None
+
+
+def test_is_stale_on_speaker_or_accent_change(tmp_path):
+    manifest = AudioManifest(tmp_path / "manifest.db", tmp_path)
+    manifest.record(
+        [
+            AudioEntry("a.mp3", 1, 1, 0.5, "x", 13, 2),
+            AudioEntry("legacy.mp3", 1, 1, None, None, None, None),
+        ]
+    )
+
+    assert not manifest.is_stale("a.mp3", 13, 2)
+    assert manifest.is_stale("a.mp3", 14, 2)
+    assert manifest.is_stale("a.mp3", 13, 0)
+    assert manifest.is_stale("missing.mp3", 13, 0)
+    assert not manifest.is_stale("legacy.mp3", 14, 1)
+
+
+def test_checksums_hash_only_unknown_files(tmp_path):
+    (tmp_path / "a.mp3").write_bytes(b"a")
+    (tmp_path / "b.mp3").write_bytes(b"b")
+    manifest = AudioManifest(tmp_path / "manifest.db", tmp_path)
+    manifest.reconcile()
+    stat = os.stat(tmp_path / "a.mp3")
+    manifest.record(
+        [AudioEntry("a.mp3", stat.st_size, stat.st_mtime_ns, 1, "x", 13, 2)]
+    )
+
+    checksums = manifest.checksums(["a.mp3", "b.mp3", "b.mp3", "gone.mp3"], workers=2)
+
+    assert checksums == {"a.mp3": "x", "b.mp3": hashlib.sha256(b"b").hexdigest()}
+    manifest.close()
+
+    reopened = AudioManifest(tmp_path / "manifest.db", tmp_path)
+    assert reopened.get("b.mp3").sha256 == checksums["b.mp3"]
+    assert reopened.get("a.mp3").speaker == 13
+    reopened.close()
+
+
+@requires_ffmpeg
+def test_pipeline_records_exported_audio(tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    manifest = AudioManifest(tmp_path / "manifest.db", output)
+
+    with FakeVoicevox() as engine:
+        pipeline = SynthesisPipeline(
+            urls=[engine.url],
+            speaker=13,
+            accents={("構築", "こうちく"): 2},
+            output_folder=output,
+            batch_size=2,
+            workers=1,
+            processes=1,
+            manifest=manifest,
+        )
+        pipeline.run(WORDS[:3])
+
+    entry = manifest.get("kouchiku.mp3")
+    assert entry.speaker == 13
+    assert entry.accent == 2
+    assert entry.size == os.path.getsize(output / "kouchiku.mp3")
+    assert entry.duration > 0
+    assert set(manifest.entries) == set(os.listdir(output))
+
+    manifest.reconcile()
+    assert manifest.get("kouchiku.mp3") == entry
@@ -0,0 +1,186 @@
+import os
+import shutil
+
+import pytest
+
+import pipeline
+from pipeline import BatchSizer, SynthesisPipeline, export_audio
+from voicevox import VoicevoxClient
+from tests.fake_voicevox import FakeVoicevox, make_wav
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="для кодирования mp3 нужен ffmpeg"
+)
+
+WORDS = [
+    ("構築", "コウチク", "kouchiku.wav"),
+    ("彼", "カレ", "kare.wav"),
+    ("言う", "イウ", "iu.wav"),
+    ("此れ", "コレ", "kore.wav"),
+    ("学校", "ガッコウ", "gakkou.wav"),
+]
+
+
+@requires_ffmpeg
+def test_pipeline_spreads_batches_over_engines(tmp_path):
+    with FakeVoicevox() as first, FakeVoicevox() as second:
+        pipeline = SynthesisPipeline(
+            urls=[first.url, second.url],
+            speaker=13,
+            accents={("構築", "こうちく"): 0},
+            output_folder=tmp_path,
+            batch_size=2,
+            workers=2,
+            processes=2,
+        )
+        pipeline.run(WORDS)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        filename.replace(".wav", ".mp3") for _, _, filename in WORDS
+    )
+    assert "/synthesis" in first.requests
+    assert "/synthesis" in second.requests
+
+
+@requires_ffmpeg
+def test_pipeline_falls_back_to_single_words(tmp_path):
+    with FakeVoicevox() as engine:
+        pipeline = SynthesisPipeline(
+            urls=[engine.url],
+            speaker=13,
+            accents={},
+            output_folder=tmp_path,
+            batch_size=3,
+            workers=1,
+            processes=1,
+        )
+        query = {
+            "accent_phrases": engine.accent_phrases("コウチクカレイウ"),
+            "prePhonemeLength": 0.1,
+            "postPhonemeLength": 0.1,
+        }
+        pipeline.synthesize_batch = lambda batch: (engine.synthesis(query), query)
+        pipeline.run(WORDS[:3])
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        filename.replace(".wav", ".mp3") for _, _, filename in WORDS[:3]
+    )
+    assert engine.requests.count("/synthesis") == 3
+
+
+@requires_ffmpeg
+def test_batch_costs_two_requests_after_template_is_cached(tmp_path):
+    with FakeVoicevox() as engine:
+        pipeline = SynthesisPipeline(
+            urls=[engine.url],
+            speaker=13,
+            accents={},
+            output_folder=tmp_path,
+            batch_size=2,
+            workers=1,
+            processes=1,
+        )
+        pipeline.run(WORDS[:4])
+
+    assert engine.requests.count("/version") == 1
+    assert engine.requests.count("/audio_query") == 1
+    assert engine.requests.count("/accent_phrases") == 2
+    assert engine.requests.count("/synthesis") == 2
+    assert pipeline.stats.total == len(engine.requests)
+
+
+def test_template_is_refetched_for_new_engine_version():
+    with FakeVoicevox(version="1.0.0") as engine:
+        client = VoicevoxClient(engine.url, 13)
+        first = client.query_template()
+        first["speedScale"] = 2.0
+        assert client.query_template()["speedScale"] == 1.0
+        assert engine.requests.count("/audio_query") == 1
+
+        engine.version = "1.1.0"
+        client.invalidate()
+        client.query_template()
+        assert engine.requests.count("/audio_query") == 2
+
+
+@requires_ffmpeg
+def test_mismatched_batch_is_split_in_halves(tmp_path):
+    troublesome = tmp_path / "troublesome.txt"
+    output = tmp_path / "out"
+    output.mkdir()
+
+    with FakeVoicevox(broken={"ガッコウ"}) as engine:
+        pipeline = SynthesisPipeline(
+            urls=[engine.url],
+            speaker=13,
+            accents={},
+            output_folder=output,
+            batch_size=4,
+            workers=1,
+            processes=1,
+            troublesome_path=troublesome,
+        )
+        pipeline.run(WORDS[1:])
+
+    assert sorted(os.listdir(output)) == sorted(
+        filename.replace(".wav", ".mp3") for _, _, filename in WORDS[1:]
+    )
+    # [4] -> [2] + [2] -> [1] + [1]: один лишний батч и два одиночных синтеза
+    assert engine.requests.count("/synthesis") == 5
+    assert troublesome.read_text(encoding="utf-8").split() == ["gakkou.wav"]
+
+    with FakeVoicevox(broken={"ガッコウ"}) as engine:
+        pipeline = SynthesisPipeline(
+            urls=[engine.url],
+            speaker=13,
+            accents={},
+            output_folder=output,
+            batch_size=4,
+            workers=1,
+            processes=1,
+            troublesome_path=troublesome,
+        )
+        pipeline.run(WORDS[1:])
+
+    assert engine.requests.count("/synthesis") == 2
+
+
+def test_batch_sizer_shrinks_on_mismatches_and_grows_back():
+    sizer = BatchSizer(8, maximum=10, window=4)
+
+    sizer.record(8, False)
+    sizer.record(8, False)
+    assert sizer.size == 4
+
+    sizer.record(8, False)  # батч старого размера не учитывается
+    assert sizer.size == 4
+
+    for _ in range(4):
+        sizer.record(4, True)
+    assert sizer.size == 5
+
+
+def test_batch_sizer_ignores_single_mismatch_after_resize():
+    sizer = BatchSizer(8, maximum=10, window=8)
+
+    sizer.record(8, False)
+    assert sizer.size == 8
+
+    for matched in (True, True, True, True, True, True, False):
+        sizer.record(8, matched)
+    assert sizer.size == 8
+
+
+@requires_ffmpeg
+def test_export_audio_skips_silence_split_for_known_singles(tmp_path, monkeypatch):
+    wav = make_wav([(0.3, True), (0.4, False), (0.3, True)])
+    assert export_audio(wav, "kare.wav", str(tmp_path))[1] == 2
+
+    def no_split(audio):
+        raise AssertionError("слово, озвучиваемое отдельно, не режется")
+
+    monkeypatch.setattr(pipeline, "_split", no_split)
+    entry, pieces, _ = export_audio(wav, "kare.wav", str(tmp_path), count_pieces=False)
+
+    assert pieces == 1
+    assert entry.filename == "kare.mp3"
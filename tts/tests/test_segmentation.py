@@ -0,0 +1,68 @@
+from segmentation import KEEP_SILENCE, parse_wav, segment_wav, word_spans
+from tests.fake_voicevox import MORA_LENGTH, SAMPLE_RATE, FakeVoicevox, make_wav
+
+SETTINGS = {
+    "speedScale": 0.8,
+    "pauseLength": 0.8,
+    "prePhonemeLength": 0.1,
+    "postPhonemeLength": 0.1,
+}
+
+
+def make_query(fake: FakeVoicevox, kana: str) -> dict:
+    return {
+        **fake.audio_query(),
+        **SETTINGS,
+        "accent_phrases": fake.accent_phrases(kana),
+    }
+
+
+def test_word_spans_follow_speed_and_pause_settings():
+    query = make_query(FakeVoicevox(), "コウチク'、カレ'")
+    spans, total = word_spans(query)
+
+    first = 4 * MORA_LENGTH / 0.8
+    second = 2 * MORA_LENGTH / 0.8
+    pause = 0.8 / 0.8
+    pre = 0.1 / 0.8
+    assert spans[0] == (pre, pre + first)
+    assert spans[1][0] == pre + first + pause
+    assert abs(spans[1][1] - (pre + first + pause + second)) < 1e-9
+    assert abs(total - (2 * pre + first + pause + second)) < 1e-9
+
+
+def test_segment_wav_slices_pcm_without_copying():
+    fake = FakeVoicevox()
+    query = make_query(fake, "コウチク'、カレ'、イウ'")
+    wav = fake.synthesis(query)
+
+    chunks = segment_wav(wav, query, 3)
+
+    assert chunks is not None
+    _, pcm = parse_wav(wav)
+    assert all(chunk.obj is pcm.obj for chunk in chunks)
+    durations = [len(chunk) / 2 / SAMPLE_RATE for chunk in chunks]
+    pre = 0.1 / 0.8
+    expected = [
+        4 * MORA_LENGTH / 0.8 + min(pre, KEEP_SILENCE) + KEEP_SILENCE,
+        2 * MORA_LENGTH / 0.8 + 2 * KEEP_SILENCE,
+        2 * MORA_LENGTH / 0.8 + KEEP_SILENCE + min(pre, KEEP_SILENCE),
+    ]
+    for duration, length in zip(durations, expected):
+        assert abs(duration - length) < 0.01
+
+
+def test_segment_wav_rejects_unexpected_audio():
+    fake = FakeVoicevox(broken={"カレ"})
+    query = make_query(fake, "コウチク'、カレ'")
+
+    # лишняя пауза внутри слова: длина звука не сходится с таймингами
+    assert segment_wav(fake.synthesis(query), query, 2) is None
+    # число слов не совпадает с числом фраз
+    assert segment_wav(FakeVoicevox().synthesis(query), query, 3) is None
+    # на месте разреза звучит тон
+    voiced = make_wav([(0.1, True)] * 1 + [(2.0, True)])
+    assert (
+        segment_wav(voiced, {**query, "accent_phrases": query["accent_phrases"]}, 2)
+        is None
+    )
@@ -0,0 +1,100 @@
+import copy
+import threading
+from collections import Counter
+
+import requests
+
+_templates: dict[tuple[str, int, str], dict] = {}
+_templates_lock = threading.Lock()
+
+
+class RequestStats:
+    """Счётчик запросов к движкам по эндпоинтам, общий для потоков."""
+
+    def __init__(self):
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, endpoint: str) -> None:
+        with self._lock:
+            self.counts[endpoint] += 1
+
+    @property
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.counts.values())
+
+    def summary(self, words: int) -> str:
+        with self._lock:
+            total = sum(self.counts.values())
+            parts = ", ".join(f"{k}: {v}" for k, v in sorted(self.counts.items()))
+        per_word = total / words if words else 0.0
+        return f"{total} ({per_word:.2f} на слово; {parts})"
+
+
+class VoicevoxClient:
+    def __init__(self, base_url: str, speaker: int, stats: RequestStats | None = None):
+        self.base_url = base_url.rstrip("/")
+        self.speaker = speaker
+        self.stats = stats or RequestStats()
+        self.session = requests.Session()
+        self._version: str | None = None
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        self.stats.add(endpoint)
+        res = self.session.request(method, f"{self.base_url}{endpoint}", **kwargs)
+        res.raise_for_status()
+        return res
+
+    def version(self, timeout: float = 15) -> str:
+        if self._version is None:
+            self._version = self._request("GET", "/version", timeout=timeout).json()
+        return self._version
+
+    def accent_phrases(self, kana: str, timeout: float = 15) -> list[dict]:
+        return self._request(
+            "POST",
+            "/accent_phrases",
+            params={"text": kana, "is_kana": True, "speaker": self.speaker},
+            timeout=timeout,
+        ).json()
+
+    def audio_query(self, text: str = "あ", timeout: float = 15) -> dict:
+        return self._request(
+            "POST",
+            "/audio_query",
+            params={"text": text, "speaker": self.speaker},
+            timeout=timeout,
+        ).json()
+
+    def query_template(self) -> dict:
+        """Заготовка запроса синтеза. Запрашивается один раз на движок,
+        голос и версию движка; каждому вызову отдаётся своя копия."""
+        key = (self.base_url, self.speaker, self.version())
+        with _templates_lock:
+            template = _templates.get(key)
+        if template is None:
+            template = self.audio_query("あ")
+            template["accent_phrases"] = []
+            with _templates_lock:
+                template = _templates.setdefault(key, template)
+        return copy.deepcopy(template)
+
+    def invalidate(self) -> None:
+        """Сбрасывает версию движка, чтобы заготовка запроса перепроверилась
+        (например, после перезапуска движка с другой версией)."""
+        with _templates_lock:
+            for key in [
+                k for k in _templates if k[:2] == (self.base_url, self.speaker)
+            ]:
+                del _templates[key]
+        self._version = None
+
+    def synthesis(self, query: dict, timeout: float = 60) -> bytes:
+        return self._request(
+            "POST",
+            "/synthesis",
+            params={"speaker": self.speaker},
+            json=query,
+            timeout=timeout,
+        ).content